@@ -0,0 +1,105 @@
+from pathlib import Path
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from data import session
+from data.bars import tick_bars
+from data.ticks import _load
+
+from .synth import make_database
+
+
+def _reference(db: sqlite3.Connection, contract: str, date: str, table: str = 'trade_reports'):
+
+    # The per-row apply pipeline load and nbars used to run, kept only to measure against.
+    ticks_df = pd.read_sql_query(f'''
+SELECT timestamp,price,size FROM {table}
+WHERE contract=? AND date=? ORDER BY timestamp;''', params=(contract, date), con=db)
+
+    ticks_df = ticks_df[(ticks_df != 0).all(1)]
+    session_open, session_close = session.bounds(date)
+    ticks_df = ticks_df[ticks_df.timestamp.between(session_open, session_close)]
+
+    ts = pd.to_datetime(ticks_df.timestamp, unit='s')
+    ts = ts.dt.tz_localize('UTC')
+    ts = ts.dt.tz_convert('US/Eastern')
+    ticks_df.timestamp = ts
+    ticks_df.index = ticks_df.timestamp
+    ticks_df = ticks_df.drop(axis=1, columns='timestamp')
+    ticks_df.price = ticks_df.price.apply(lambda x: x * 1e-2)
+    ticks_df['size'] = ticks_df['size'] * 1e2
+    ticks_df = ticks_df.reset_index()
+
+    t = ticks_df.timestamp.apply(lambda x: x.timestamp() - session_open)
+
+    return ticks_df, t
+
+
+def _current(db: sqlite3.Connection, contract: str, date: str, n: int):
+    ticks_df = _load(db, contract, date)
+    return ticks_df, tick_bars(ticks_df, n)
+
+
+def _best(f, repeat: int) -> float:
+    times = list()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def run(database: Path, contract: str, date: str, n: int = 20, repeat: int = 3) -> dict:
+
+    with sqlite3.connect(database) as db:
+
+        # Both pipelines must produce the same ticks before their times mean anything.
+        ref_df, _ = _reference(db, contract, date)
+        cur_df, _ = _current(db, contract, date, n)
+        pd.testing.assert_frame_equal(ref_df, cur_df, check_exact=True)
+
+        reference = _best(lambda: _reference(db, contract, date), repeat)
+        current = _best(lambda: _current(db, contract, date, n), repeat)
+
+    return {'ticks': len(cur_df),
+            'reference_s': reference,
+            'current_s': current,
+            'speedup': reference / current}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Time the vectorized load and normalize path against the '
+                                                 'per-row apply pipeline it replaced.')
+    parser.add_argument('--database', type=Path, help='existing database; a synthetic one is made if omitted')
+    parser.add_argument('--contract', default='AAA')
+    parser.add_argument('--date', default='2020-07-29')
+    parser.add_argument('--ticks', type=int, default=1000000, help='ticks in the synthetic day')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-speedup', type=float, default=1.0,
+                        help='exit with an error if the current path is not at least this much faster')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        database = args.database
+        if database is None:
+            database = make_database(Path(tmp) / 'bench.sqlite3', [args.contract], [args.date], args.ticks)
+
+        r = run(database, args.contract, args.date, repeat=args.repeat)
+
+    print(f"{r['ticks']} ticks: reference {r['reference_s'] * 1e3:.1f} ms, current {r['current_s'] * 1e3:.1f} ms, "
+          f"{r['ticks'] / r['current_s']:.3g} ticks/s, speedup {r['speedup']:.1f}x")
+
+    if r['speedup'] < args.min_speedup:
+        print(f"regression: speedup {r['speedup']:.2f}x below {args.min_speedup:.2f}x")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
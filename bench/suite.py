@@ -0,0 +1,192 @@
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List
+import argparse
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from data.ticks import load, nbars
+
+from .synth import contract_names, dates, make_database
+
+stages = ('load', 'nbars', 'ohlcv_plot', 'save')
+
+
+def _database(db_dir: Path, ticks: int, contracts: int, days: int, seed: int) -> Path:
+
+    # Databases are reused across runs, as generating large ones takes far longer than the benchmark.
+    path = Path(db_dir) / f'bench_{ticks}_{contracts}_{days}_{seed}.sqlite3'
+    if not path.exists():
+        print(f'generating {path.name}')
+        make_database(path.with_suffix('.tmp'), contract_names(contracts), dates(days), ticks, seed)
+        path.with_suffix('.tmp').rename(path)
+
+    return path
+
+
+def _measure(f: Callable, repeat: int) -> Dict[str, float]:
+
+    # Best time of repeat runs, then one more run under tracemalloc for the peak, as tracing slows it down.
+    times = list()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        f()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'seconds': min(times), 'peak_mb': peak / 2 ** 20}
+
+
+def run_size(database: Path,
+             contract: str,
+             date: str,
+             n: int = 20,
+             repeat: int = 3,
+             fmt: str = 'svg',
+             out_dir: Path = None,
+             only: List[str] = stages) -> Dict[str, dict]:
+
+    results = dict()
+    quiet = io.StringIO()
+
+    # Each stage runs on the previous stage's output, so only its own work is timed.
+    with redirect_stdout(quiet):
+        ticks_df = load(database, contract, date)
+    bars_df = nbars(ticks_df, n)
+
+    def record(stage, f, items, unit):
+        if stage in only:
+            r = _measure(f, repeat)
+            r['items'] = items
+            r['throughput'] = items / r['seconds']
+            r['unit'] = unit
+            results[stage] = r
+
+    def load_stage():
+        with redirect_stdout(quiet):
+            load(database, contract, date)
+
+    record('load', load_stage, len(ticks_df), 'ticks/s')
+    record('nbars', lambda: nbars(ticks_df, n), len(ticks_df), 'ticks/s')
+
+    # Plotting needs pycairo, so it is only imported for the stages that draw.
+    if 'ohlcv_plot' in only or 'save' in only:
+        from plot import ohlcv_plot
+
+        record('ohlcv_plot', lambda: ohlcv_plot(bars_df), len(bars_df), 'bars/s')
+
+        fig, _ = ohlcv_plot(bars_df)
+        path = Path(out_dir or tempfile.gettempdir()) / f'bench_{contract}_{date}.{fmt}'
+
+        def save_stage():
+            fig.invalidate()
+            fig.save(path)
+
+        record('save', save_stage, len(bars_df), 'bars/s')
+
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+
+    # A stage regresses when it is slower than the baseline by more than tolerance.
+    regressions = list()
+    for size, stage_results in results['results'].items():
+        for stage, r in stage_results.items():
+            b = baseline.get('results', dict()).get(size, dict()).get(stage)
+            if b is None:
+                continue
+
+            ratio = r['seconds'] / b['seconds']
+            r['baseline_seconds'] = b['seconds']
+            r['ratio'] = ratio
+            if ratio > 1 + tolerance:
+                regressions.append(f'{size} {stage}: {b["seconds"] * 1e3:.1f} ms -> {r["seconds"] * 1e3:.1f} ms '
+                                   f'({ratio:.2f}x)')
+
+    return regressions
+
+
+def report(results: dict):
+
+    print(f'{"ticks":>10} {"stage":>11} {"ms":>10} {"throughput":>18} {"peak MB":>9} {"vs base":>8}')
+    for size, stage_results in results['results'].items():
+        for stage, r in stage_results.items():
+            ratio = f'{r["ratio"]:.2f}x' if 'ratio' in r else ''
+            print(f'{size:>10} {stage:>11} {r["seconds"] * 1e3:>10.1f} '
+                  f'{r["throughput"]:>10.3g} {r["unit"]:<7} {r["peak_mb"]:>9.1f} {ratio:>8}')
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Benchmark load -> nbars -> ohlcv_plot -> save on synthetic '
+                                                 'databases, and compare against a stored baseline.')
+    parser.add_argument('--ticks', type=float, nargs='+', default=[1e4, 1e5, 1e6],
+                        help='ticks per contract and day, one database each')
+    parser.add_argument('--contracts', type=int, default=4)
+    parser.add_argument('--days', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--n', type=int, default=20, help='ticks per bar')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', nargs='+', choices=stages, default=list(stages))
+    parser.add_argument('--format', default='svg', help='file format for the save stage')
+    parser.add_argument('--db-dir', type=Path, default=Path(tempfile.gettempdir()) / 'pyfintools_bench')
+    parser.add_argument('--output', type=Path, help='write results as JSON')
+    parser.add_argument('--baseline', type=Path, help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown, as a fraction')
+    args = parser.parse_args()
+
+    args.db_dir.mkdir(parents=True, exist_ok=True)
+
+    results = {'meta': {'python': platform.python_version(),
+                        'numpy': np.__version__,
+                        'pandas': pd.__version__,
+                        'machine': platform.machine(),
+                        'n': args.n,
+                        'contracts': args.contracts,
+                        'days': args.days},
+               'results': dict()}
+
+    for ticks in args.ticks:
+        ticks = int(ticks)
+        database = _database(args.db_dir, ticks, args.contracts, args.days, args.seed)
+
+        # The last contract on the last day stands in for a day of that size.
+        contract, date = contract_names(args.contracts)[-1], dates(args.days)[-1]
+        results['results'][str(ticks)] = run_size(database, contract, date, args.n, args.repeat,
+                                                  args.format, args.db_dir, args.stages)
+
+    regressions = list()
+    if args.baseline is not None:
+        with open(args.baseline, 'rt') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    report(results)
+
+    if args.output is not None:
+        with open(args.output, 'wt') as f:
+            json.dump(results, f, indent=2)
+
+    if len(regressions) > 0:
+        print('regressions:')
+        for r in regressions:
+            print(f'  {r}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import Iterable, List
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from data import session
+from data.maintenance import create_indexes, rebuild_dates_contracts
+
+
+def contract_names(n: int) -> List[str]:
+    return [f'C{i:04d}' for i in range(n)]
+
+
+def make_database(path: Path,
+                  contracts: Iterable[str] = ('AAA',),
+                  dates: Iterable[str] = ('2020-07-29',),
+                  ticks_per_day: int = 10000,
+                  seed: int = 0,
+                  table: str = 'trade_reports',
+                  meta_table: str = 'dates_contracts',
+                  chunk_size: int = 1 << 18) -> Path:
+
+    # Random-walk trades over each session, plus a few off-hours and zero rows for the filters to drop.
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    rng = np.random.default_rng(seed)
+
+    db = sqlite3.connect(path)
+    try:
+        db.execute(f'''
+CREATE TABLE {table}(
+    id INTEGER PRIMARY KEY,
+    date DATETIME,
+    contract CHAR(16),
+    timestamp INTEGER,
+    price INTEGER,
+    size INTEGER);''')
+
+        for date in dates:
+            session_open, session_close = session.bounds(date)
+            for contract in contracts:
+                n = ticks_per_day
+                ts = np.sort(rng.integers(int(session_open) - 1800, int(session_close) + 1800, n))
+                price = np.maximum(1000 + np.cumsum(rng.integers(-3, 4, n)), 1)
+                size = rng.integers(1, 50, n)
+                size[rng.random(n) < 1e-3] = 0
+
+                # Insert in slices, so 1e7-tick days never hold all rows as Python objects.
+                for i in range(0, n, chunk_size):
+                    rows = zip(ts[i:i + chunk_size].tolist(), price[i:i + chunk_size].tolist(),
+                               size[i:i + chunk_size].tolist())
+                    db.executemany(f'INSERT INTO {table}(date,contract,timestamp,price,size) VALUES(?,?,?,?,?);',
+                                   ((date, contract, t, p, s) for t, p, s in rows))
+        db.commit()
+
+        create_indexes(db, table)
+        rebuild_dates_contracts(db, table, meta_table)
+    finally:
+        db.close()
+
+    return path
+
+
+def dates(n: int, start: str = '2020-07-01') -> List[str]:
+
+    # The first n trading days from start.
+    schedule = session.precompute(start, pd.Timestamp(start) + pd.Timedelta(days=2 * n + 10))
+    return [d.strftime('%Y-%m-%d') for d in schedule.index[:n]]
@@ -1,3 +1,18 @@
 from .ticks import load
 from .ticks import nbars
 from .ticks import metadata
+from .bars import tick_bars
+from .bars import time_bars
+from .bars import volume_bars
+from .bars import dollar_bars
+from .bars import imbalance_bars
+from .stream import BarAggregator
+from .cache import TickCache
+from .bulk import iter_load
+from .bulk import load_many
+from .ticks import load_batch
+from .store import TickStore
+from .compact import CompactTicks
+from .ticks import iter_chunks
+from .stream import ChunkAggregator
+from .stream import chunk_bars
@@ -0,0 +1,183 @@
+from typing import Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import session
+from .compact import CompactTicks
+
+
+def _session_seconds(data: Union[pd.DataFrame, CompactTicks],
+                     bounds: Tuple[float, float] = None) -> Tuple[np.ndarray, Tuple[float, float]]:
+
+    if isinstance(data, CompactTicks):
+        ns, tz = data.timestamp_ns, data.tz
+    else:
+        ns, tz = data.timestamp.values.astype('datetime64[ns]').view(np.int64), data.timestamp.dt.tz
+
+    # Session open and close on the day of the first tick, unless already known.
+    if bounds is None:
+        bounds = session.bounds(pd.Timestamp(ns[0], tz='UTC').tz_convert(tz).date())
+
+    # Seconds since the open, subtracted in int64 nanoseconds before scaling.
+    return (ns - np.int64(round(bounds[0] * 1e9))) / 1e9, bounds
+
+
+def _tick_rule(price: np.ndarray, last_price: float = None, last_sign: int = 0) -> np.ndarray:
+
+    # Sign of each price change, carrying the last non-zero sign through unchanged prices.
+    # last_price and last_sign continue the rule from ticks before these.
+    sign = np.sign(np.diff(price, prepend=price[0] if last_price is None else last_price)).astype(np.int64)
+    if sign[0] == 0:
+        sign[0] = last_sign
+    last = np.where(sign != 0, np.arange(len(sign)), 0)
+    np.maximum.accumulate(last, out=last)
+
+    return sign[last]
+
+
+def _bar_arrays(price: np.ndarray,
+                size: np.ndarray,
+                timestamp: np.ndarray,
+                starts: np.ndarray,
+                sign: np.ndarray = None) -> dict:
+
+    if sign is None:
+        sign = _tick_rule(price)
+
+    # Index of last tick in each bar.
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1] = len(price) - 1
+
+    volume = np.add.reduceat(size, starts)
+    notional = np.add.reduceat(price * size, starts)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = notional / volume
+
+    return {
+        'open': price[starts],
+        'high': np.maximum.reduceat(price, starts),
+        'low': np.minimum.reduceat(price, starts),
+        'close': price[ends],
+        'volume': volume,
+        't_open': timestamp[starts],
+        't_close': timestamp[ends],
+        'notional': notional,
+        'vwap': vwap,
+        'count': ends - starts + 1,
+        'buy_volume': np.add.reduceat(np.where(sign > 0, size, 0), starts),
+        'sell_volume': np.add.reduceat(np.where(sign < 0, size, 0), starts)}
+
+
+def _bars(data: Union[pd.DataFrame, CompactTicks],
+          starts: np.ndarray,
+          times: tuple = None,
+          sign: np.ndarray = None) -> pd.DataFrame:
+
+    if times is None:
+        times = _session_seconds(data)
+    ts, bounds = times
+
+    # Calculate values for each bar in a single pass; bar open and close are in seconds since market open.
+    bars_df = pd.DataFrame(_bar_arrays(data.price.values, data['size'].values, ts, starts, sign))
+    bars_df.attrs['session'] = bounds
+
+    return bars_df
+
+
+def _starts(bar_ids: np.ndarray) -> np.ndarray:
+
+    # First tick of each run of equal bar ids.
+    return np.flatnonzero(np.diff(bar_ids, prepend=bar_ids[0] - 1))
+
+
+def _first_hit(cum: np.ndarray, target: np.ndarray) -> np.ndarray:
+
+    # For each i find the first j > i with cum[j] == target[i], or the last index if there is none.
+    m = len(cum)
+    c_min = cum.min()
+    keys = np.sort((cum - c_min) * m + np.arange(m))
+
+    query = (target - c_min) * m + np.arange(m) + 1
+    pos = np.searchsorted(keys, query)
+    found = pos < m
+    pos[~found] = m - 1
+    hit = found & (keys[pos] // m == target - c_min)
+
+    return np.where(hit, keys[pos] % m, m - 1)
+
+
+def _chain(nxt: np.ndarray, max_steps: int) -> np.ndarray:
+
+    # Follow nxt from node 0 by pointer doubling, visiting every node on the path in O(log n) passes.
+    steps = np.arange(max_steps + 1)
+    pos = np.zeros_like(steps)
+    jump = nxt.copy()
+
+    k = 0
+    while (steps >> k).any():
+        bit = ((steps >> k) & 1).astype(bool)
+        pos[bit] = jump[pos[bit]]
+        jump = jump[jump]
+        k += 1
+
+    return np.unique(pos)
+
+
+def tick_bars(data: pd.DataFrame, n: int = 20) -> pd.DataFrame:
+
+    # Group ticks into groups of n.
+    starts = np.arange(0, len(data), n)
+
+    return _bars(data, starts)
+
+
+def time_bars(data: pd.DataFrame, seconds: float = 60) -> pd.DataFrame:
+
+    times = _session_seconds(data)
+
+    # Bucket ticks into fixed intervals since market open; empty intervals produce no bar.
+    bar_ids = np.floor(times[0] / seconds).astype(np.int64)
+
+    return _bars(data, _starts(bar_ids), times)
+
+
+def volume_bars(data: pd.DataFrame, threshold: float = 1e4) -> pd.DataFrame:
+
+    # A bar closes each time cumulative traded volume crosses a multiple of threshold.
+    size = data['size'].values
+    traded = np.cumsum(size) - size
+    bar_ids = np.floor(traded / threshold).astype(np.int64)
+
+    return _bars(data, _starts(bar_ids))
+
+
+def dollar_bars(data: pd.DataFrame, threshold: float = 1e6) -> pd.DataFrame:
+
+    # A bar closes each time cumulative traded value crosses a multiple of threshold.
+    value = data.price.values * data['size'].values
+    traded = np.cumsum(value) - value
+    bar_ids = np.floor(traded / threshold).astype(np.int64)
+
+    return _bars(data, _starts(bar_ids))
+
+
+def imbalance_bars(data: pd.DataFrame, threshold: int = 20) -> pd.DataFrame:
+
+    n = len(data)
+
+    # Cumulative signed tick imbalance. Each step is -1, 0 or 1, so a bar starting after tick s closes
+    # exactly when the imbalance first reaches cum[s] +/- threshold.
+    sign = _tick_rule(data.price.values)
+    cum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(sign, out=cum[1:])
+
+    nxt = np.minimum(_first_hit(cum, cum + threshold),
+                     _first_hit(cum, cum - threshold))
+
+    # Every bar spans at least threshold ticks.
+    starts = _chain(nxt, n // threshold + 1)
+
+    return _bars(data, starts[starts < n], sign=sign)
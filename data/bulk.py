@@ -0,0 +1,128 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple, Union
+import datetime as dt
+import sqlite3
+import threading
+
+import pandas as pd
+
+from .maintenance import MMAP_SIZE
+from .ticks import _load
+
+Key = Tuple[str, Union[str, dt.date]]
+
+# Read-only connection of a worker process.
+_process_db = None
+
+
+def connect(database: Path) -> sqlite3.Connection:
+
+    # Read-only connections can be shared by readers without taking write locks.
+    uri = f'file:{Path(database).resolve()}?mode=ro'
+    db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    # Memory-mapped I/O is a per-connection setting.
+    db.execute(f'PRAGMA mmap_size={MMAP_SIZE};')
+
+    return db
+
+
+def _keys(keys: Union[Iterable[Key], pd.DataFrame]) -> Iterable[Key]:
+
+    # Accept a slice of data.ticks.metadata as well as (contract, date) pairs.
+    if isinstance(keys, pd.DataFrame):
+        return zip(keys.contract, keys.date)
+
+    return keys
+
+
+def _init_process(database: Path):
+    global _process_db
+    _process_db = connect(database)
+
+
+def _load_process(key: Key, table: str, query_filter: bool, errors: str):
+
+    try:
+        return key, _load(_process_db, *key, table, query_filter)
+    except ValueError:
+        if errors == 'raise':
+            raise
+        return key, None
+
+
+def iter_load(database: Path,
+              keys: Union[Iterable[Key], pd.DataFrame],
+              workers: int = 4,
+              processes: bool = False,
+              table: str = 'trade_reports',
+              query_filter: bool = False,
+              errors: str = 'raise') -> Iterator[Tuple[Key, pd.DataFrame]]:
+
+    if errors not in ('raise', 'skip'):
+        raise ValueError(f'unknown errors mode {errors}')
+
+    # One connection per worker thread, reused for every key that thread loads.
+    conns = dict()
+
+    def load_thread(key: Key):
+
+        db = conns.get(threading.get_ident())
+        if db is None:
+            db = conns[threading.get_ident()] = connect(database)
+
+        try:
+            return key, _load(db, *key, table, query_filter)
+        except ValueError:
+            if errors == 'raise':
+                raise
+            return key, None
+
+    if processes:
+        pool = ProcessPoolExecutor(workers, initializer=_init_process, initargs=(database,))
+        submit = lambda key: pool.submit(_load_process, key, table, query_filter, errors)
+    else:
+        pool = ThreadPoolExecutor(workers)
+        submit = lambda key: pool.submit(load_thread, key)
+
+    # Keep a bounded number of loads in flight and yield results in key order.
+    pending = deque()
+    try:
+        for key in _keys(keys):
+            pending.append(submit(key))
+            if len(pending) >= 2 * workers:
+                key, ticks_df = pending.popleft().result()
+                if ticks_df is not None:
+                    yield key, ticks_df
+
+        while pending:
+            key, ticks_df = pending.popleft().result()
+            if ticks_df is not None:
+                yield key, ticks_df
+
+    finally:
+        for f in pending:
+            f.cancel()
+        pool.shutdown()
+        for db in conns.values():
+            db.close()
+
+
+def load_many(database: Path,
+              keys: Union[Iterable[Key], pd.DataFrame],
+              workers: int = 4,
+              processes: bool = False,
+              table: str = 'trade_reports',
+              query_filter: bool = False,
+              errors: str = 'raise') -> pd.DataFrame:
+
+    results = list(iter_load(database, keys, workers, processes, table, query_filter, errors))
+
+    if len(results) == 0:
+        raise ValueError('no ticks found for any key')
+
+    return pd.concat([r[1] for r in results],
+                     keys=[r[0] for r in results],
+                     names=['contract', 'date', 'tick'])
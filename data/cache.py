@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Union
+import datetime as dt
+import json
+import os
+import shutil
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .ticks import load
+
+
+# Caches cleaned ticks for each (contract, date) as one .npy file per column under root, so repeat
+# loads memory-map the arrays instead of querying and cleaning again. Entries are invalidated when the
+# source database changes: on its modification time ('mtime') or on the contract's row count for the
+# date ('rows').
+class TickCache:
+
+    columns = ('timestamp', 'price', 'size')
+
+    def __init__(self, root: Path, invalidate: str = 'mtime'):
+
+        if invalidate not in ('mtime', 'rows'):
+            raise ValueError(f'unknown invalidation mode {invalidate}')
+
+        self.root = Path(root)
+        self.invalidate = invalidate
+
+    def path(self, contract: str, date: Union[str, dt.date]) -> Path:
+        return self.root / contract / str(date)
+
+    def _signature(self, database: Path, contract: str, date: Union[str, dt.date], table: str):
+
+        if self.invalidate == 'rows':
+            with sqlite3.connect(database) as db:
+                return db.execute(f'SELECT COUNT(*) FROM {table} WHERE contract=? AND date=?;',
+                                  (contract, date)).fetchone()[0]
+
+        # Writes in WAL mode land in the -wal file until checkpointed.
+        sig = [os.stat(database).st_mtime_ns]
+        wal = Path(str(database) + '-wal')
+        if wal.exists():
+            sig.append(os.stat(wal).st_mtime_ns)
+
+        return sig
+
+    def _valid(self, path: Path, source: str, signature) -> bool:
+
+        try:
+            with open(path / 'meta.json', 'rt') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        return meta.get('source') == source and meta.get('signature') == signature
+
+    def _store(self, path: Path, ticks_df: pd.DataFrame, source: str, signature):
+
+        # Write to a scratch directory then swap it in, so readers never see a partial entry.
+        tmp = path.with_name(path.name + f'.tmp{os.getpid()}')
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        ts = ticks_df.timestamp.values.astype('datetime64[ns]').view(np.int64)
+        np.save(tmp / 'timestamp.npy', ts)
+        np.save(tmp / 'price.npy', ticks_df.price.values)
+        np.save(tmp / 'size.npy', ticks_df['size'].values)
+
+        with open(tmp / 'meta.json', 'wt') as f:
+            json.dump({'source': source, 'signature': signature}, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+    def _read(self, path: Path) -> pd.DataFrame:
+
+        arrays = {c: np.load(path / f'{c}.npy', mmap_mode='r') for c in self.columns}
+
+        ts = pd.DatetimeIndex(arrays['timestamp'].view('datetime64[ns]'))
+        ts = ts.tz_localize('UTC').tz_convert('US/Eastern')
+
+        return pd.DataFrame({'timestamp': ts,
+                             'price': arrays['price'],
+                             'size': arrays['size']},
+                            copy=False)
+
+    def load(self,
+             database: Path,
+             contract: str,
+             date: Union[str, dt.date],
+             table: str = 'trade_reports') -> pd.DataFrame:
+
+        path = self.path(contract, date)
+        source = str(Path(database).resolve())
+        signature = self._signature(database, contract, date, table)
+
+        if not self._valid(path, source, signature):
+            self._store(path, load(database, contract, date, table), source, signature)
+
+        return self._read(path)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
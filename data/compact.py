@@ -0,0 +1,68 @@
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+# Ticks as stored: int64 epoch nanoseconds, int32 price in cents and int32 size in lots, 16 bytes a tick.
+# The float price and size and the tz-aware timestamps of data.ticks.load are views built on access and
+# never kept, so the bar builders take either this or a frame.
+class CompactTicks:
+
+    columns = ('timestamp', 'price', 'size')
+
+    def __init__(self,
+                 timestamp_ns: np.ndarray,
+                 price_cents: np.ndarray,
+                 size_lots: np.ndarray,
+                 tz: str = 'US/Eastern'):
+
+        self.timestamp_ns = np.asarray(timestamp_ns, dtype=np.int64)
+        self.price_cents = np.asarray(price_cents, dtype=np.int32)
+        self.size_lots = np.asarray(size_lots, dtype=np.int32)
+        self.tz = tz
+
+    @classmethod
+    def from_frame(cls, ticks_df: pd.DataFrame) -> 'CompactTicks':
+        ts = ticks_df.timestamp
+        return cls(ts.values.astype('datetime64[ns]').view(np.int64),
+                   np.rint(ticks_df.price.values * 1e2),
+                   np.rint(ticks_df['size'].values * 1e-2),
+                   str(ts.dt.tz))
+
+    def __len__(self) -> int:
+        return len(self.timestamp_ns)
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamp_ns.nbytes + self.price_cents.nbytes + self.size_lots.nbytes
+
+    @property
+    def timestamp(self) -> pd.Series:
+        ts = pd.DatetimeIndex(self.timestamp_ns.view('datetime64[ns]')).tz_localize('UTC').tz_convert(self.tz)
+        return pd.Series(ts, name='timestamp')
+
+    @property
+    def price(self) -> pd.Series:
+
+        # Pice is in cents.
+        return pd.Series(self.price_cents * 1e-2, name='price')
+
+    @property
+    def size(self) -> pd.Series:
+
+        # Scale size to shares from lots.
+        return pd.Series(self.size_lots * 1e2, name='size')
+
+    def __getitem__(self, key: Union[str, slice, np.ndarray]):
+
+        if isinstance(key, str):
+            if key not in self.columns:
+                raise KeyError(key)
+            return getattr(self, key)
+
+        # Row selections share the arrays where numpy allows.
+        return CompactTicks(self.timestamp_ns[key], self.price_cents[key], self.size_lots[key], self.tz)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({c: self[c] for c in self.columns})
@@ -0,0 +1,110 @@
+from pathlib import Path
+from typing import List
+import argparse
+import sqlite3
+
+MMAP_SIZE = 1 << 34
+
+
+def query_plan(db: sqlite3.Connection, table: str = 'trade_reports') -> List[str]:
+
+    # Plan of the query used by data.ticks.load.
+    rows = db.execute(f'''
+EXPLAIN QUERY PLAN SELECT timestamp,price,size FROM {table}
+WHERE contract=? AND date=? ORDER BY timestamp;''', ('', '')).fetchall()
+
+    return [r[-1] for r in rows]
+
+
+def create_indexes(db: sqlite3.Connection, table: str = 'trade_reports'):
+
+    # Covering index for load, which also serves the (contract, date) range scans of load_batch.
+    db.execute(f'''
+CREATE INDEX IF NOT EXISTS {table}_contract_date_timestamp
+ON {table}(contract, date, timestamp, price, size);''')
+
+    db.execute(f'ANALYZE {table};')
+    db.commit()
+
+
+def rebuild_dates_contracts(db: sqlite3.Connection,
+                            table: str = 'trade_reports',
+                            meta_table: str = 'dates_contracts'):
+
+    db.execute(f'DROP TABLE IF EXISTS {meta_table};')
+    db.execute(f'''
+CREATE TABLE {meta_table}(
+    id INTEGER PRIMARY KEY,
+    date DATETIME NOT NULL,
+    contract CHAR(16) NOT NULL,
+    tick_count INTEGER NOT NULL DEFAULT(0));''')
+
+    db.execute(f'''
+INSERT INTO {meta_table}(date, contract, tick_count)
+SELECT date, contract, COUNT(*) FROM {table} GROUP BY date, contract ORDER BY date, contract;''')
+
+    db.execute(f'CREATE UNIQUE INDEX {meta_table}_date_contract ON {meta_table}(date, contract);')
+    db.commit()
+
+
+def configure(db: sqlite3.Connection, page_size: int = None):
+
+    # Page size can only change outside WAL mode, and only takes effect after VACUUM.
+    if page_size is not None and db.execute('PRAGMA page_size;').fetchone()[0] != page_size:
+
+        # VACUUM rewrites the whole file and needs about as much free disk again while it runs.
+        nbytes = db.execute('PRAGMA page_count;').fetchone()[0] * db.execute('PRAGMA page_size;').fetchone()[0]
+        print(f'warning: changing page size to {page_size} rewrites all {nbytes / 2 ** 30:.2f} GiB of the '
+              f'database and needs as much free disk')
+
+        db.execute('PRAGMA journal_mode=DELETE;')
+        db.execute(f'PRAGMA page_size={int(page_size)};')
+        db.execute('VACUUM;')
+
+    db.execute('PRAGMA journal_mode=WAL;')
+
+
+def migrate(database: Path,
+            table: str = 'trade_reports',
+            meta_table: str = 'dates_contracts',
+            page_size: int = None):
+
+    db = sqlite3.connect(database)
+    try:
+        before = query_plan(db, table)
+
+        # Page size first, so a VACUUM does not also rewrite the new index.
+        configure(db, page_size)
+        create_indexes(db, table)
+        rebuild_dates_contracts(db, table, meta_table)
+
+        after = query_plan(db, table)
+    finally:
+        db.close()
+
+    return before, after
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Index and tune a tick database.')
+    parser.add_argument('database', type=Path)
+    parser.add_argument('--table', default='trade_reports')
+    parser.add_argument('--meta-table', default='dates_contracts')
+    parser.add_argument('--page-size', type=int,
+                        help='page size to VACUUM into, e.g. 65536; rewrites the whole database')
+    args = parser.parse_args()
+
+    before, after = migrate(args.database, args.table, args.meta_table, args.page_size)
+
+    print('query plan before:')
+    for line in before:
+        print(f'  {line}')
+
+    print('query plan after:')
+    for line in after:
+        print(f'  {line}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+from typing import Iterable, List, Optional, Tuple, Union
+import datetime as dt
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+import pandas_market_calendars as mcal
+
+REGULAR_OPEN = 9.5 * 60 * 60
+REGULAR_CLOSE = 16 * 60 * 60
+
+# Session schedules as epoch seconds, keyed by calendar name, and the calendar years they cover.
+# Both are only updated together under _lock, as loader threads look up sessions concurrently.
+_schedules = dict()
+_years = dict()
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def calendar(name: str = 'NYSE'):
+    return mcal.get_calendar(name)
+
+
+def _epoch(values) -> np.ndarray:
+    return pd.DatetimeIndex(values).values.astype('datetime64[ns]').view(np.int64) * 1e-9
+
+
+def _days(dates: Iterable) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(np.asarray(dates, dtype='datetime64[D]'))
+
+
+def precompute(start: Union[str, dt.date],
+               end: Union[str, dt.date],
+               name: str = 'NYSE') -> pd.DataFrame:
+
+    # Whole calendar years are fetched in one call, so later lookups anywhere in them are hits.
+    y0, y1 = pd.Timestamp(start).year, pd.Timestamp(end).year
+
+    with _lock:
+        years = _years.setdefault(name, set())
+        missing = [y for y in range(y0, y1 + 1) if y not in years]
+
+        if len(missing) > 0:
+            schedule = calendar(name).schedule(start_date=f'{missing[0]}-01-01', end_date=f'{missing[-1]}-12-31')
+            sessions = pd.DataFrame({'open': _epoch(schedule.market_open),
+                                     'close': _epoch(schedule.market_close)},
+                                    index=_days(schedule.index.values))
+
+            sessions = pd.concat([_schedules.get(name), sessions])
+            _schedules[name] = sessions[~sessions.index.duplicated()].sort_index()
+            years.update(range(missing[0], missing[-1] + 1))
+
+        schedules = _schedules[name]
+
+    return schedules.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+
+def regular_bounds(dates: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+
+    # Regular 9:30 to 16:00 hours in US/Eastern.
+    midnight = _days(dates).tz_localize('US/Eastern')
+    return (_epoch(midnight + pd.Timedelta(seconds=REGULAR_OPEN)),
+            _epoch(midnight + pd.Timedelta(seconds=REGULAR_CLOSE)))
+
+
+def bounds_many(dates: Iterable,
+                name: str = 'NYSE',
+                fallback: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+
+    days = _days(dates)
+    if len(days) == 0:
+        return np.empty(0), np.empty(0)
+
+    sessions = precompute(days.min(), days.max(), name).reindex(days)
+    session_open, session_close = sessions.open.values, sessions.close.values
+
+    # Days without a session are NaN, or regular hours with fallback.
+    if fallback:
+        closed = np.isnan(session_open)
+        if closed.any():
+            regular_open, regular_close = regular_bounds(days[closed])
+            session_open[closed] = regular_open
+            session_close[closed] = regular_close
+
+    return session_open, session_close
+
+
+def bounds(date: Union[str, dt.date],
+           name: str = 'NYSE',
+           fallback: bool = True) -> Optional[Tuple[float, float]]:
+
+    session_open, session_close = bounds_many([date], name, fallback)
+
+    if np.isnan(session_open[0]):
+        return None
+
+    return float(session_open[0]), float(session_close[0])
+
+
+def hour_ticks(session_open: float,
+               session_close: float,
+               tz: str = 'US/Eastern') -> Tuple[List[float], List[str]]:
+
+    # Session open plus every whole hour up to the close, as seconds since open.
+    t0 = pd.Timestamp(session_open, unit='s', tz='UTC').tz_convert(tz)
+    t1 = pd.Timestamp(session_close, unit='s', tz='UTC').tz_convert(tz)
+    times = [t0] + [t for t in pd.date_range(t0.ceil('H'), t1, freq='H') if t > t0]
+
+    return [t.timestamp() - session_open for t in times], [f'{t.hour}:{t.minute:02d}' for t in times]
@@ -0,0 +1,177 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Tuple, Union
+import datetime as dt
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .bars import tick_bars
+from .bulk import connect
+from .compact import CompactTicks
+from .ticks import _load
+
+
+# Single access point for ticks and bars of one database. Holds a pool of read-only connections, one per
+# thread using the store so loads run concurrently, an in-memory index of dates_contracts for existence
+# checks, and an LRU cache of loaded frames bounded by memory_budget bytes, so browsing back and forth
+# across contracts and dates reuses loaded data.
+# With compact, ticks are held as CompactTicks. Returned frames are shared with the cache and must not be
+# modified in place.
+class TickStore:
+
+    def __init__(self,
+                 database: Path,
+                 memory_budget: int = 1 << 30,
+                 table: str = 'trade_reports',
+                 meta_table: str = 'dates_contracts',
+                 query_filter: bool = False,
+                 compact: bool = False):
+
+        self.database = Path(database)
+        self.memory_budget = memory_budget
+        self.table = table
+        self.meta_table = meta_table
+        self.query_filter = query_filter
+        self.compact = compact
+
+        # Read-only connections keyed by thread.
+        self._conns = dict()
+        self._conns_lock = threading.Lock()
+
+        self._meta = None
+        self._index = None
+
+        self._cache = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+
+        # Connection of the calling thread, opened on its first use.
+        db = self._conns.get(threading.get_ident())
+        if db is None:
+            db = connect(self.database)
+            with self._conns_lock:
+                self._conns[threading.get_ident()] = db
+        return db
+
+    def close(self):
+        with self._conns_lock:
+            for db in self._conns.values():
+                db.close()
+            self._conns.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load_meta(self):
+
+        meta = pd.read_sql_query(
+            f'SELECT date, contract FROM {self.meta_table} ORDER BY date,contract;', self.connection)
+
+        # contract -> set of dates, for O(1) membership tests.
+        index = dict()
+        for contract, date in zip(meta.contract, meta.date):
+            index.setdefault(contract, set()).add(date)
+
+        self._meta = meta
+        self._index = index
+
+    @property
+    def meta(self) -> pd.DataFrame:
+        if self._meta is None:
+            self._load_meta()
+        return self._meta
+
+    @property
+    def index(self) -> Dict[str, set]:
+        if self._index is None:
+            self._load_meta()
+        return self._index
+
+    def contracts(self) -> np.ndarray:
+        return np.sort(self.meta.contract.unique())
+
+    def dates(self, contract: str = None) -> np.ndarray:
+        if contract is None:
+            return np.sort(self.meta.date.unique())
+        return np.array(sorted(self.index.get(contract, ())), dtype=object)
+
+    def has(self, contract: str, date: Union[str, dt.date]) -> bool:
+        return str(date) in self.index.get(contract, ())
+
+    def __contains__(self, key: Tuple[str, Union[str, dt.date]]) -> bool:
+        return self.has(*key)
+
+    def _get(self, key):
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return value[0]
+
+    def _put(self, key, df: Union[pd.DataFrame, CompactTicks]):
+
+        if isinstance(df, CompactTicks):
+            nbytes = df.nbytes
+        else:
+            nbytes = int(df.memory_usage(index=True).sum())
+
+        # Frames larger than the whole budget are returned but never cached.
+        if nbytes > self.memory_budget:
+            return
+
+        with self._cache_lock:
+            if key in self._cache:
+                self.nbytes -= self._cache.pop(key)[1]
+
+            self._cache[key] = (df, nbytes)
+            self.nbytes += nbytes
+
+            while self.nbytes > self.memory_budget:
+                _, (_, evicted) = self._cache.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self.nbytes = 0
+
+    def ticks(self, contract: str, date: Union[str, dt.date]) -> Union[pd.DataFrame, CompactTicks]:
+
+        date = str(date)
+        if not self.has(contract, date):
+            raise ValueError(f'ticks not found for {contract} on {date}')
+
+        key = ('ticks', contract, date)
+        ticks_df = self._get(key)
+        if ticks_df is None:
+            ticks_df = _load(self.connection, contract, date, self.table, self.query_filter, self.compact)
+            self._put(key, ticks_df)
+
+        return ticks_df
+
+    def bars(self, contract: str, date: Union[str, dt.date], n: int = 20) -> pd.DataFrame:
+
+        key = ('bars', contract, str(date), n)
+        bars_df = self._get(key)
+        if bars_df is None:
+            bars_df = tick_bars(self.ticks(contract, date), n)
+            self._put(key, bars_df)
+
+        return bars_df
+
+    def info(self) -> Dict[str, int]:
+        return {'entries': len(self._cache), 'nbytes': self.nbytes, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,226 @@
+from collections import namedtuple
+from typing import Iterable, List, Optional, Tuple, Union
+import math
+
+import numpy as np
+import pandas as pd
+
+from . import session
+from .bars import _bar_arrays, _session_seconds, _starts, _tick_rule
+from .compact import CompactTicks
+
+Bar = namedtuple('Bar', ['open', 'high', 'low', 'close', 'volume', 't_open', 't_close',
+                         'notional', 'vwap', 'count', 'buy_volume', 'sell_volume'])
+
+
+# Incrementally aggregates ticks into bars with the same schema as data.bars. Bars are closed every
+# size ticks ('tick'), every size seconds since market open ('time') or each time cumulative traded
+# volume crosses a multiple of size ('volume'). Tick timestamps are seconds since epoch.
+class BarAggregator:
+
+    kinds = ('tick', 'time', 'volume')
+
+    def __init__(self, kind: str = 'tick', size: float = 20, session_open: Optional[float] = None):
+
+        if kind not in self.kinds:
+            raise ValueError(f'unknown bar kind {kind}')
+
+        self.kind = kind
+        self.size = size
+
+        self.t0 = session_open
+
+        self.traded = 0.0
+        self.last_price = None
+        self.last_sign = 0
+        self._reset(None)
+
+    def _reset(self, bar_id):
+        self.bar_id = bar_id
+        self.count = 0
+        self.open = self.high = self.low = self.close = None
+        self.volume = 0.0
+        self.notional = 0.0
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.t_open = self.t_close = None
+
+    def _bar(self) -> Bar:
+        vwap = self.notional / self.volume if self.volume != 0 else float('nan')
+        return Bar(self.open, self.high, self.low, self.close, self.volume,
+                   self.t_open - self.t0, self.t_close - self.t0,
+                   self.notional, vwap, self.count, self.buy_volume, self.sell_volume)
+
+    @property
+    def current(self) -> Optional[Bar]:
+        return self._bar() if self.count > 0 else None
+
+    def update(self, timestamp: float, price: float, size: float) -> Optional[Bar]:
+
+        if self.t0 is None:
+            date = pd.Timestamp(timestamp, unit='s', tz='UTC').tz_convert('US/Eastern').date()
+            self.t0 = session.bounds(date)[0]
+
+        done = None
+
+        # Time bars only complete once a tick arrives in a later interval.
+        if self.kind == 'time':
+            bar_id = math.floor((timestamp - self.t0) / self.size)
+            if self.count > 0 and bar_id != self.bar_id:
+                done = self._bar()
+                self._reset(bar_id)
+            self.bar_id = bar_id
+
+        if self.count == 0:
+            self.open = self.high = self.low = price
+            self.t_open = timestamp
+        else:
+            self.high = max(self.high, price)
+            self.low = min(self.low, price)
+
+        # Classify trade direction with the tick rule.
+        if self.last_price is not None and price != self.last_price:
+            self.last_sign = 1 if price > self.last_price else -1
+        self.last_price = price
+
+        if self.last_sign > 0:
+            self.buy_volume += size
+        elif self.last_sign < 0:
+            self.sell_volume += size
+
+        self.close = price
+        self.t_close = timestamp
+        self.volume += size
+        self.notional += price * size
+        self.count += 1
+
+        if self.kind == 'tick':
+            if self.count >= self.size:
+                done = self._bar()
+                self._reset(None)
+
+        elif self.kind == 'volume':
+            traded = self.traded + size
+            if math.floor(traded / self.size) > math.floor(self.traded / self.size):
+                done = self._bar()
+                self._reset(None)
+            self.traded = traded
+
+        return done
+
+    def update_batch(self, timestamp: np.ndarray, price: np.ndarray, size: np.ndarray) -> List[Bar]:
+
+        bars = list()
+        for bar in map(self.update, np.asarray(timestamp).tolist(),
+                       np.asarray(price).tolist(),
+                       np.asarray(size).tolist()):
+            if bar is not None:
+                bars.append(bar)
+
+        return bars
+
+    def flush(self) -> Optional[Bar]:
+
+        bar = self.current
+        self._reset(None)
+
+        return bar
+
+
+# Builds bars from successive chunks of one day's ticks, e.g. from data.ticks.iter_chunks, with vectorized
+# work per chunk. Only the ticks of the last, still open bar are carried to the next chunk, so memory is
+# bounded by the chunk size. Bars are the same as the data.bars builder of the same kind.
+class ChunkAggregator:
+
+    kinds = ('tick', 'time', 'volume', 'dollar')
+
+    def __init__(self, kind: str = 'tick', size: float = 20):
+
+        if kind not in self.kinds:
+            raise ValueError(f'unknown bar kind {kind}')
+
+        self.kind = kind
+        self.size = size
+
+        self.bounds = None
+        self.last_price = None
+        self.last_sign = 0
+
+        # Ticks of the open bar, and volume or value traded before them.
+        self.carry = None
+        self.traded = 0.0
+
+    def _bar_ids(self, t: np.ndarray, price: np.ndarray, size: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+
+        if self.kind == 'tick':
+            return np.arange(len(t)) // self.size, None
+
+        if self.kind == 'time':
+            return np.floor(t / self.size).astype(np.int64), None
+
+        # Summed on from the carried total in order, so the sums match a single pass over the day.
+        value = size if self.kind == 'volume' else price * size
+        traded = np.cumsum(np.r_[self.traded, value])[:-1]
+
+        return np.floor(traded / self.size).astype(np.int64), traded
+
+    def _frame(self, arrays: dict) -> pd.DataFrame:
+        bars_df = pd.DataFrame(arrays, columns=list(Bar._fields))
+        bars_df.attrs['session'] = self.bounds
+        return bars_df
+
+    def update(self, chunk: Union[pd.DataFrame, CompactTicks]) -> pd.DataFrame:
+
+        if len(chunk) == 0:
+            return self._frame(None)
+
+        t, self.bounds = _session_seconds(chunk, self.bounds)
+        price = chunk.price.values
+        size = chunk['size'].values
+        sign = _tick_rule(price, self.last_price, self.last_sign)
+        self.last_price, self.last_sign = price[-1], sign[-1]
+
+        if self.carry is not None:
+            t, price, size, sign = (np.concatenate(a) for a in zip(self.carry, (t, price, size, sign)))
+
+        bar_ids, traded = self._bar_ids(t, price, size)
+
+        # The last bar stays open until a later chunk or flush.
+        split = np.searchsorted(bar_ids, bar_ids[-1])
+        self.carry = tuple(a[split:].copy() for a in (t, price, size, sign))
+        if traded is not None:
+            self.traded = traded[split]
+
+        if split == 0:
+            return self._frame(None)
+
+        return self._frame(_bar_arrays(price[:split], size[:split], t[:split], _starts(bar_ids[:split]), sign[:split]))
+
+    def flush(self) -> pd.DataFrame:
+
+        if self.carry is None:
+            return self._frame(None)
+
+        t, price, size, sign = self.carry
+        self.carry = None
+
+        return self._frame(_bar_arrays(price, size, t, np.zeros(1, dtype=np.int64), sign))
+
+
+def chunk_bars(chunks: Iterable[Union[pd.DataFrame, CompactTicks]],
+               kind: str = 'tick',
+               size: float = 20) -> pd.DataFrame:
+
+    agg = ChunkAggregator(kind, size)
+    frames = [agg.update(c) for c in chunks]
+    frames.append(agg.flush())
+
+    # No chunks, e.g. when every row of the day was outside the session, gives no bars.
+    frames = [f for f in frames if len(f) > 0]
+    if len(frames) == 0:
+        return agg._frame(None)
+
+    bars_df = pd.concat(frames, ignore_index=True)
+    bars_df.attrs['session'] = agg.bounds
+
+    return bars_df
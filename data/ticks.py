@@ -1,11 +1,15 @@
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterator, List, Tuple, Union
 import datetime as dt
 import sqlite3
 
 import pandas as pd
 import numpy as np
 
+from . import session
+from .bars import tick_bars
+from .compact import CompactTicks
+
 
 def metadata(database: Path, table: str = 'dates_contracts') -> pd.DataFrame:
 
@@ -14,76 +18,219 @@ def metadata(database: Path, table: str = 'dates_contracts') -> pd.DataFrame:
     return data
 
 
+def _query(contract: str,
+           date: Union[str, dt.date],
+           table: str,
+           query_filter: bool) -> Tuple[str, tuple]:
+
+    where = 'contract=? AND date=?'
+    params = (contract, date)
+
+    # Let SQLite drop zero rows and trades outside the session, including early closes.
+    if query_filter:
+        bounds = session.bounds(date, fallback=False)
+        if bounds is None:
+            raise ValueError(f'market closed on date {date}')
+        where += ' AND timestamp BETWEEN ? AND ? AND price!=0 AND size!=0'
+        params += bounds
+
+    return f'''
+SELECT timestamp,price,size FROM {table}
+WHERE {where} ORDER BY timestamp;''', params
+
+
+def _keep(timestamp: np.ndarray, price: np.ndarray, size: np.ndarray, date: Union[str, dt.date]) -> np.ndarray:
+
+    # Drop rows with 0 and trades outside market hours.
+    session_open, session_close = session.bounds(date)
+    keep = (timestamp != 0) & (price != 0) & (size != 0)
+    keep &= (timestamp >= session_open) & (timestamp <= session_close)
+
+    return keep
+
+
+def _iter_rows(db: sqlite3.Connection,
+               contract: str,
+               date: Union[str, dt.date],
+               table: str = 'trade_reports',
+               query_filter: bool = False,
+               chunk_size: int = 1 << 16) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+
+    # Rows go straight into arrays a chunk at a time, without a frame or per-row objects.
+    cursor = db.execute(*_query(contract, date, table, query_filter))
+    empty = True
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if len(rows) == 0:
+            break
+        empty = False
+
+        timestamp, price, size = np.array(rows, dtype=np.float64).reshape(-1, 3).T
+
+        if not query_filter:
+            keep = _keep(timestamp, price, size, date)
+            timestamp, price, size = timestamp[keep], price[keep], size[keep]
+
+        yield timestamp, price, size
+
+    if empty:
+        raise ValueError(f'ticks not found for {contract} on date {date}')
+
+
+def _ticks(timestamp: np.ndarray,
+           price: np.ndarray,
+           size: np.ndarray,
+           compact: bool = False) -> Union[pd.DataFrame, CompactTicks]:
+
+    if compact:
+        return CompactTicks(pd.to_datetime(timestamp, unit='s').values.view(np.int64),
+                            np.rint(price),
+                            np.rint(size))
+
+    # Localize timestamps, and scale price from cents and size from lots to shares, as whole arrays.
+    return pd.DataFrame({'timestamp': pd.to_datetime(timestamp, unit='s', utc=True).tz_convert('US/Eastern'),
+                         'price': price * 1e-2,
+                         'size': size * 1e2})
+
+
+def _load(db: sqlite3.Connection,
+          contract: str,
+          date: Union[str, dt.date],
+          table: str = 'trade_reports',
+          query_filter: bool = False,
+          compact: bool = False) -> Union[pd.DataFrame, CompactTicks]:
+
+    chunks = list(_iter_rows(db, contract, date, table, query_filter))
+    timestamp, price, size = (np.concatenate(c) for c in zip(*chunks))
+
+    return _ticks(timestamp, price, size, compact)
+
+
 def load(database: Path,
          contract: str,
          date: Union[str, dt.date],
-         table: str = 'trade_reports') -> pd.DataFrame:
+         table: str = 'trade_reports',
+         query_filter: bool = False,
+         compact: bool = False) -> Union[pd.DataFrame, CompactTicks]:
 
     print(f'loading {contract} -> {date}')
 
     with sqlite3.connect(database) as db:
-        ticks_df = pd.read_sql_query(f'''
-SELECT timestamp,price,size FROM {table}
-WHERE contract=? AND date=? ORDER BY timestamp;''',
-                                     params=(contract, date),
-                                     con=db)
-
-    if len(ticks_df) == 0:
-        raise ValueError(f'ticks not found for {contract} on date {date}')
+        return _load(db, contract, date, table, query_filter, compact)
 
-    # Drop rows with 0.
-    ticks_df = ticks_df[(ticks_df != 0).all(1)]
 
-    # Localize timestamps.
-    ts = pd.to_datetime(ticks_df.timestamp, unit='s')
-    ts = ts.dt.tz_localize('UTC')
-    ts = ts.dt.tz_convert('US/Eastern')
-    ticks_df.timestamp = ts
+def iter_chunks(database: Path,
+                contract: str,
+                date: Union[str, dt.date],
+                table: str = 'trade_reports',
+                query_filter: bool = False,
+                chunk_size: int = 1 << 16,
+                compact: bool = False) -> Iterator[Union[pd.DataFrame, CompactTicks]]:
 
-    # Make timestamp row index.
-    ticks_df.index = ticks_df.timestamp
+    print(f'loading {contract} -> {date} in chunks of {chunk_size}')
 
-    # Drop trades outside market hours.
-    ticks_df = ticks_df.between_time('9:30', '16:00')
+    # Cleaned ticks of at most chunk_size rows at a time, so memory stays flat however busy the day was.
+    db = sqlite3.connect(database)
+    try:
+        for timestamp, price, size in _iter_rows(db, contract, date, table, query_filter, chunk_size):
+            if len(timestamp) > 0:
+                yield _ticks(timestamp, price, size, compact)
+    finally:
+        db.close()
 
-    # Drop redundent timestamp column.
-    ticks_df = ticks_df.drop(axis=1, columns='timestamp')
 
-    # Pice is in cents.
-    ticks_df.price = ticks_df.price.apply(lambda x: x * 1e-2)
+def _clean(timestamp: np.ndarray, price: np.ndarray, size: np.ndarray):
 
-    # Scale size to shares from lots.
-    ticks_df.loc[:, 'size'] *= 1e2
+    # Drop rows with 0.
+    keep = (timestamp != 0) & (price != 0) & (size != 0)
 
-    return ticks_df.reset_index()
+    # Localize timestamps.
+    ts = pd.to_datetime(timestamp[keep], unit='s', utc=True).tz_convert('US/Eastern')
+
+    # Drop trades outside each day's session.
+    days, day_idx = np.unique(ts.tz_localize(None).values.astype('datetime64[D]'), return_inverse=True)
+    session_open, session_close = session.bounds_many(days)
+    in_hours = (timestamp[keep] >= session_open[day_idx]) & (timestamp[keep] <= session_close[day_idx])
+    keep[keep] = in_hours
+
+    return keep, ts[in_hours]
+
+
+def load_batch(database: Path,
+               contracts: List[str],
+               start: Union[str, dt.date],
+               end: Union[str, dt.date] = None,
+               table: str = 'trade_reports',
+               chunk_size: int = 1 << 16) -> Dict[Tuple[str, str], pd.DataFrame]:
+
+    if end is None:
+        end = start
+
+    if len(contracts) == 0:
+        return dict()
+
+    # Number contracts in the query so rows can be fetched as plain numbers.
+    contract_ids = ' '.join(['WHEN ? THEN ?'] * len(contracts))
+    contract_params = [p for i, c in enumerate(contracts) for p in (c, i)]
+    placeholders = ','.join('?' * len(contracts))
+    where = f'contract IN ({placeholders}) AND date BETWEEN ? AND ?'
+    params = list(contracts) + [str(start), str(end)]
+
+    dtype = np.dtype([('contract', np.int32),
+                      ('day', np.int32),
+                      ('timestamp', np.float64),
+                      ('price', np.float64),
+                      ('size', np.float64)])
+
+    db = sqlite3.connect(database)
+    try:
+        # Count and fetch in one read transaction, so both see the same rows while a writer is active.
+        db.execute('BEGIN;')
+        n = db.execute(f'SELECT COUNT(*) FROM {table} WHERE {where};', params).fetchone()[0]
+        rows = np.empty(n, dtype=dtype)
+
+        cursor = db.execute(f'''
+SELECT CASE contract {contract_ids} END,CAST(julianday(date) - 2440587.5 AS INTEGER),timestamp,price,size
+FROM {table} WHERE {where} ORDER BY contract,date,timestamp;''',
+                            contract_params + params)
+
+        i = 0
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if len(chunk) == 0:
+                break
+            rows[i:i + len(chunk)] = np.array(chunk, dtype=dtype)
+            i += len(chunk)
+        db.execute('COMMIT;')
+    finally:
+        db.close()
+
+    rows = rows[:i]
+    keep, ts = _clean(rows['timestamp'], rows['price'], rows['size'])
+    rows = rows[keep]
+
+    # Pice is in cents, size is in lots.
+    price = rows['price'] * 1e-2
+    size = rows['size'] * 1e2
+    contract, day = rows['contract'], rows['day']
+
+    # Split on changes of (contract, date) in one pass.
+    splits = np.flatnonzero((np.diff(contract) != 0) | (np.diff(day) != 0)) + 1
+    bounds = zip(np.r_[0, splits], np.r_[splits, len(contract)])
+
+    epoch = dt.date(1970, 1, 1)
+    ticks = dict()
+    for a, b in bounds:
+        if a == b:
+            continue
+        key = (contracts[contract[a]], str(epoch + dt.timedelta(days=int(day[a]))))
+        ticks[key] = pd.DataFrame({'timestamp': ts[a:b],
+                                   'price': price[a:b],
+                                   'size': size[a:b]})
+
+    return ticks
 
 
 def nbars(data: pd.DataFrame, n: int = 20):
 
-    # Group ticks into groups of n.
-    groups = data.groupby(data.index // n)
-
-    # Calculate values for each bar.
-    cols = ['open', 'high', 'low', 'close', 'volume', 't_open', 't_close']
-    data = list()
-    for key, item in groups:
-        data.append([
-            item.iloc[0].price,
-            item.price.max(),
-            item.price.min(),
-            item.iloc[-1].price,
-            item.price.sum(),
-            item.iloc[0].timestamp,
-            item.iloc[-1].timestamp])
-
-    bars_df = pd.DataFrame(data=data, columns=cols)
-
-    # Scale bar open and close timestamps to seconds since market open @ 9.30 am.
-    t0 = bars_df.t_open.iloc[0].replace(hour=9, minute=30, second=0).timestamp()
-    t1 = bars_df.t_open.iloc[0].replace(hour=16, minute=0, second=0).timestamp()
-    td = 1 / (t1 - t0) * (16 - 9.5) * 60 * 60
-
-    bars_df.t_open = bars_df.t_open.apply(lambda x: (x.timestamp() - t0) * td)
-    bars_df.t_close = bars_df.t_close.apply(lambda x: (x.timestamp() - t0) * td)
-
-    return bars_df
+    return tick_bars(data, n)
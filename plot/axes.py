@@ -1,7 +1,6 @@
-import numpy as np
 import cairo
 
-from .geometry import Rect, Point
+from .geometry import Affine, Rect, Point
 
 
 class Axes:
@@ -19,7 +18,22 @@ class Axes:
         self.background_color = (0.86, 0.86, 0.86, 0)
         self.border_color = (0, 0, 0, 1)
 
-    def layout(self, rect: Rect, transform: np.ndarray):
+        self.parent = None
+        self._layout_key = None
+
+    def invalidate(self, layout: bool = True):
+        if layout:
+            self._layout_key = None
+        if self.parent is not None:
+            self.parent.invalidate(layout)
+
+    def layout(self, rect: Rect, transform: Affine):
+
+        # Only series whose layout was invalidated are laid out again when the rect is unchanged.
+        key = (tuple(rect.position.xy), tuple(rect.scale.xy))
+        if key == self._layout_key:
+            self._layout_series()
+            return
 
         m = self.margins
         p = self.padding
@@ -33,16 +47,24 @@ class Axes:
 
         self.rect_inner = Rect(Point(rect.position.x + m[0] + b + p[0], rect.position.y + m[2] + b + p[2]),
                                Point(w - m[0] - m[1] - 2 * b - p[0] - p[1], h - m[2] - m[3] - 2 * b - p[2] - p[3]))
-        inner_pos = self.rect_inner.position
-        inner_scale = self.rect_inner.scale
 
+        # Compose onto the parent's unit -> device transform.
         self.transform = transform
-        self.transform_inner = np.array([[inner_scale.x, 0, inner_pos.x],
-                                         [0, inner_scale.y, inner_pos.y],
-                                         [0, 0, 1]])
+        self.transform_inner = transform @ Affine.from_rect(self.rect_inner, rect)
+
+        for ps in self.plot_series:
+            ps.layout_valid = False
+        self._layout_series()
+
+        self._layout_key = key
+
+    def _layout_series(self):
 
         for ps in self.plot_series:
-            ps.layout(self.rect_inner, self.transform_inner)
+            ps.parent = self
+            if not ps.layout_valid:
+                ps.layout(self.rect_inner, self.transform_inner)
+                ps.layout_valid = True
 
     def draw(self, ctx: cairo.Context):
 
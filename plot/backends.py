@@ -0,0 +1,77 @@
+from io import BytesIO
+import math
+
+import cairo
+import numpy as np
+
+
+class SVGBackend:
+
+    name = 'svg'
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+
+    def surface(self, width: float, height: float) -> cairo.Surface:
+        self.buffer = BytesIO()
+        return cairo.SVGSurface(self.buffer, width * self.scale, height * self.scale)
+
+    def result(self, surface: cairo.Surface):
+        surface.finish()
+        return self.buffer.getvalue()
+
+
+class PDFBackend(SVGBackend):
+
+    name = 'pdf'
+
+    def surface(self, width: float, height: float) -> cairo.Surface:
+        self.buffer = BytesIO()
+        return cairo.PDFSurface(self.buffer, width * self.scale, height * self.scale)
+
+
+class ArrayBackend(SVGBackend):
+
+    name = 'array'
+
+    def surface(self, width: float, height: float) -> cairo.Surface:
+        return cairo.ImageSurface(cairo.FORMAT_ARGB32,
+                                  math.ceil(width * self.scale),
+                                  math.ceil(height * self.scale))
+
+    def result(self, surface: cairo.Surface) -> np.ndarray:
+        surface.flush()
+
+        # Pixels are premultiplied native-endian 32-bit ARGB words; unpack to RGBA bytes.
+        h, w = surface.get_height(), surface.get_width()
+        argb = np.frombuffer(surface.get_data(), dtype=np.uint32).reshape(h, surface.get_stride() // 4)[:, :w]
+
+        rgba = np.empty((h, w, 4), dtype=np.uint8)
+        for i, shift in enumerate((16, 8, 0, 24)):
+            rgba[..., i] = (argb >> shift) & 0xff
+
+        return rgba
+
+
+class PNGBackend(ArrayBackend):
+
+    name = 'png'
+
+    def result(self, surface: cairo.Surface):
+        surface.flush()
+        buffer = BytesIO()
+        surface.write_to_png(buffer)
+        return buffer.getvalue()
+
+
+backends = {b.name: b for b in (SVGBackend, PDFBackend, PNGBackend, ArrayBackend)}
+
+
+def get_backend(backend):
+
+    if isinstance(backend, str):
+        if backend not in backends:
+            raise ValueError(f'unknown backend {backend}')
+        return backends[backend]()
+
+    return backend
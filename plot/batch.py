@@ -0,0 +1,86 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Tuple, Union
+import datetime as dt
+import os
+
+import pandas as pd
+
+from data.bars import tick_bars
+from data.ticks import load
+
+from .plot import ohlcv_plot
+
+Item = Union[pd.DataFrame, Tuple[str, Union[str, dt.date]]]
+
+
+def _render(index: int, item: Item, out_dir: Path, database: Path, n: int, fmt: str) -> Path:
+
+    # Bars are either given, or loaded and built for a (contract, date) key.
+    if isinstance(item, pd.DataFrame):
+        bars_df = item
+        name = f'{index:05d}'
+        title = ''
+    else:
+        contract, date = item
+        bars_df = tick_bars(load(database, contract, date), n)
+        name = f'{contract}_{date}'
+        title = f'{contract} @ {date}'
+
+    fig, _ = ohlcv_plot(bars_df)
+    fig.set_title(title)
+
+    path = Path(out_dir) / f'{name}.{fmt}'
+    fig.save(path)
+
+    return path
+
+
+def _print_progress(done: int, key, result):
+    if isinstance(result, Exception):
+        print(f'[{done}] {key} failed: {result}')
+    else:
+        print(f'[{done}] {key} -> {result}')
+
+
+def render_batch(items: Iterable[Item],
+                 out_dir: Path,
+                 database: Path = None,
+                 n: int = 10,
+                 fmt: str = 'svg',
+                 workers: int = None,
+                 progress: Callable = _print_progress):
+
+    workers = workers or os.cpu_count()
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results = dict()
+    errors = dict()
+
+    # Keep a bounded number of charts in flight, so bars are only held for charts being rendered.
+    with ProcessPoolExecutor(workers) as pool:
+
+        pending = dict()
+
+        def collect(futures):
+            for f in futures:
+                key = pending.pop(f)
+                try:
+                    results[key] = f.result()
+                except Exception as e:
+                    errors[key] = e
+                if progress is not None:
+                    progress(len(results) + len(errors), key, errors.get(key, results.get(key)))
+
+        for index, item in enumerate(items):
+            key = index if isinstance(item, pd.DataFrame) else tuple(item)
+            pending[pool.submit(_render, index, item, out_dir, database, n, fmt)] = key
+
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        collect(wait(pending)[0])
+
+    return results, errors
@@ -4,7 +4,8 @@ from pathlib import Path
 import cairo
 import numpy as np
 
-from .geometry import Point, Rect
+from .backends import ArrayBackend, get_backend
+from .geometry import Affine, Point, Rect
 
 
 class Figure:
@@ -27,6 +28,15 @@ class Figure:
         self.title = ''
         self.sup_title = ''
 
+        # Layout and rendered output are computed lazily and kept until invalidated.
+        self.layout_valid = False
+        self._output = None
+
+    def invalidate(self, layout: bool = True):
+        if layout:
+            self.layout_valid = False
+        self._output = None
+
     def layout(self):
 
         m = self.margins
@@ -41,10 +51,8 @@ class Figure:
         inner_pos = self.rect_inner.position
         inner_scale = self.rect_inner.scale
 
-        self.transform = np.eye(3)
-        self.transform_inner = np.array([[inner_scale.x, 0, inner_pos.x],
-                                         [0, inner_scale.y, inner_pos.y],
-                                         [0, 0, 1]])
+        self.transform = Affine()
+        self.transform_inner = Affine.scale_translate(inner_scale.x, inner_scale.y, inner_pos.x, inner_pos.y)
 
         y_pos = self.rect_inner.position.y
         h = self.rect_inner.scale.y / len(self.axes)
@@ -57,21 +65,32 @@ class Figure:
             for j in range(len(self.axes[i])):
 
                 child_rect = Rect(Point(x_pos, y_pos), Point(w, h))
-                child_trans = np.array([[w, 0, x_pos],
-                                        [0, h, y_pos],
-                                        [0, 0, 1]])
+                child_trans = Affine.scale_translate(w, h, x_pos, y_pos)
+                self.axes[i][j].parent = self
                 self.axes[i][j].layout(child_rect, child_trans)
                 x_pos += w
 
             y_pos += h
 
-    def draw(self):
+        self.layout_valid = True
+
+    def draw(self, backend='svg'):
 
-        self.buffer = BytesIO()
-        surf = cairo.SVGSurface(self.buffer, *self.rect.scale.xy)
+        backend = get_backend(backend)
+        surf = backend.surface(*self.rect.scale.xy)
 
         ctx = cairo.Context(surf)
-        ctx.scale(1, 1)
+        ctx.scale(backend.scale, backend.scale)
+        self.paint(ctx)
+
+        output = backend.result(surf)
+        self._output = ((backend.name, backend.scale), output)
+
+        return output
+
+    def paint(self, ctx: cairo.Context):
+
+        # Draw the laid out figure onto any context, in figure units.
         ctx.set_line_width(0.0002)
 
         ctx.set_source_rgb(0, 0, 0)
@@ -97,13 +116,6 @@ class Figure:
             ctx.rectangle(*b0.xy, *b1.xy)
             ctx.stroke()
 
-        inner_pos = self.rect_inner.position
-        inner_scale = self.rect_inner.scale
-
-        trans = np.array([[inner_scale.x, 0, inner_pos.x],
-                          [0, inner_scale.y, inner_pos.y],
-                          [0, 0, 1]])
-
         for i in range(len(self.axes)):
             for j in range(len(self.axes[i])):
                 self.axes[i][j].draw(ctx)
@@ -117,11 +129,43 @@ class Figure:
         ctx.move_to(0.5 * w - txt_w / 2, 35 + txt_h)
         ctx.show_text(self.sup_title)
 
+    def render(self, backend='svg'):
+
+        # Lay out and draw only if something changed since the last render with this backend.
+        backend = get_backend(backend)
+        if not self.layout_valid:
+            self.layout()
+            self._output = None
+
+        if self._output is None or self._output[0] != (backend.name, backend.scale):
+            self.draw(backend)
+
+        return self._output[1]
+
+    @property
+    def buffer(self) -> BytesIO:
+        return BytesIO(self.render('svg'))
+
     def set_title(self, title: str):
         self.title = title
-        self.layout()
-        self.draw()
+        self.invalidate(layout=False)
+
+    def set_sup_title(self, sup_title: str):
+        self.sup_title = sup_title
+        self.invalidate(layout=False)
+
+    def set_size(self, width: float, height: float):
+        self.rect = Rect(Point(0, 0), Point(width, height))
+        self.invalidate()
+
+    def save(self, path: Path, backend=None):
+
+        # Pick the backend from the file extension.
+        if backend is None:
+            backend = Path(path).suffix.lstrip('.').lower() or 'svg'
 
-    def save(self, path: Path):
         with open(path, 'wb') as f:
-            f.write(self.buffer.getvalue())
+            f.write(self.render(backend))
+
+    def to_array(self, scale: float = 1.0) -> np.ndarray:
+        return self.render(ArrayBackend(scale))
@@ -1,40 +1,33 @@
+import cairo
 import numpy as np
 
 
-class Point(np.ndarray):
+class Point:
 
-    def __new__(cls, x, y, *args, **kwargs):
-        return super(Point, cls).__new__(cls, *args, shape=(3,), **kwargs)
+    __slots__ = ('x', 'y')
 
     def __init__(self, x, y):
-        self[0:3] = [x, y, 1]
+        self.x = x
+        self.y = y
 
     @property
-    def x(self):
-        return self[0]
-
-    @x.setter
-    def x(self, value):
-        self.x = value
+    def xy(self):
+        return self.x, self.y
 
-    @property
-    def y(self):
-        return self[1]
+    def __iter__(self):
+        return iter((self.x, self.y))
 
-    @y.setter
-    def y(self, value):
-        self.y = value
-
-    @property
-    def xy(self):
-        return self[:2]
+    def __eq__(self, other):
+        return isinstance(other, Point) and self.xy == other.xy
 
     def __str__(self):
-        return 'Point( x={}, y={} )'.format(*self[:2])
+        return 'Point( x={}, y={} )'.format(self.x, self.y)
 
 
 class Rect:
 
+    __slots__ = ('position', 'scale')
+
     def __init__(self, position: Point, scale: Point):
         self.position = position
         self.scale = scale
@@ -42,6 +35,9 @@ class Rect:
     def __str__(self):
         return 'Rect( position={}, scale={} )'.format(self.position, self.scale)
 
+    def __eq__(self, other):
+        return isinstance(other, Rect) and self.position == other.position and self.scale == other.scale
+
     def __getitem__(self, idx):
         if idx > 1:
             raise StopIteration
@@ -50,3 +46,68 @@ class Rect:
             return self.position
         else:
             return self.scale
+
+
+class Affine:
+
+    # 2D affine map x' = xx * x + xy * y + x0, y' = yx * x + yy * y + y0, in cairo's matrix layout.
+    __slots__ = ('xx', 'yx', 'xy', 'yy', 'x0', 'y0')
+
+    def __init__(self, xx=1.0, yx=0.0, xy=0.0, yy=1.0, x0=0.0, y0=0.0):
+        self.xx = xx
+        self.yx = yx
+        self.xy = xy
+        self.yy = yy
+        self.x0 = x0
+        self.y0 = y0
+
+    @classmethod
+    def scale_translate(cls, sx, sy, tx, ty):
+        return cls(sx, 0.0, 0.0, sy, tx, ty)
+
+    @classmethod
+    def from_rect(cls, rect: Rect, parent: Rect = None, flip_y: bool = False) -> 'Affine':
+
+        # Unit square onto rect, in the unit coordinates of parent if given; flip_y puts y = 0 at the bottom.
+        x, y = rect.position.xy
+        w, h = rect.scale.xy
+        if parent is not None:
+            x = (x - parent.position.x) / parent.scale.x
+            y = (y - parent.position.y) / parent.scale.y
+            w = w / parent.scale.x
+            h = h / parent.scale.y
+
+        if flip_y:
+            return cls.scale_translate(w, -h, x, y + h)
+        return cls.scale_translate(w, h, x, y)
+
+    def __matmul__(self, other: 'Affine') -> 'Affine':
+
+        # Composition applying other first, then self, as for 3x3 matrices.
+        return Affine(self.xx * other.xx + self.xy * other.yx,
+                      self.yx * other.xx + self.yy * other.yx,
+                      self.xx * other.xy + self.xy * other.yy,
+                      self.yx * other.xy + self.yy * other.yy,
+                      self.xx * other.x0 + self.xy * other.y0 + self.x0,
+                      self.yx * other.x0 + self.yy * other.y0 + self.y0)
+
+    def apply(self, x, y):
+
+        # Works on scalars and on whole coordinate arrays alike.
+        return self.xx * x + self.xy * y + self.x0, self.yx * x + self.yy * y + self.y0
+
+    def apply_vector(self, x, y):
+        return self.xx * x + self.xy * y, self.yx * x + self.yy * y
+
+    def cairo_matrix(self) -> cairo.Matrix:
+        return cairo.Matrix(self.xx, self.yx, self.xy, self.yy, self.x0, self.y0)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return np.array([[self.xx, self.xy, self.x0],
+                         [self.yx, self.yy, self.y0],
+                         [0.0, 0.0, 1.0]])
+
+    def __str__(self):
+        return 'Affine( xx={}, yx={}, xy={}, yy={}, x0={}, y0={} )'.format(
+            self.xx, self.yx, self.xy, self.yy, self.x0, self.y0)
@@ -0,0 +1,167 @@
+from typing import Tuple
+import math
+
+import cairo
+import numpy as np
+import pandas as pd
+
+from .backends import ArrayBackend
+from .ohlcv import bar_x
+from .plot import ohlcv_plot
+
+Region = Tuple[int, int, int, int]
+
+
+# Bars of a live chart in column arrays that grow by doubling, so an update copies only the rows it
+# writes. frame is a view of the filled rows shared by all panels; it changes with later updates.
+class BarBuffer:
+
+    def __init__(self, bars: pd.DataFrame, capacity: int = 1 << 12):
+        self.columns = list(bars.columns)
+        self.attrs = dict(bars.attrs)
+        self.arrays = {c: np.empty(max(capacity, len(bars)), dtype=bars[c].dtype) for c in self.columns}
+        self.frame = self._write(0, bars)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _write(self, start: int, bars: pd.DataFrame) -> pd.DataFrame:
+
+        end = start + len(bars)
+        for c in self.columns:
+            a = self.arrays[c]
+            if end > len(a):
+                grown = np.empty(max(2 * len(a), end), dtype=a.dtype)
+                grown[:start] = a[:start]
+                a = self.arrays[c] = grown
+            a[start:end] = bars[c].values
+
+        frame = pd.DataFrame({c: a[:end] for c, a in self.arrays.items()}, copy=False)
+        frame.attrs = self.attrs
+
+        return frame
+
+    def append(self, bars: pd.DataFrame) -> int:
+
+        # Rows opening at or before the last bar replace the trailing bars from there, e.g. a forming candle.
+        # Returns the first row written.
+        start = int(np.searchsorted(self.arrays['t_open'][:len(self)], bars.t_open.values[0]))
+        self.frame = self._write(start, bars)
+
+        return start
+
+
+class LiveChart:
+
+    def __init__(self,
+                 bars: pd.DataFrame,
+                 width: float = 800,
+                 height: float = 600,
+                 scale: float = 1.0,
+                 title: str = ''):
+
+        # Every bar is drawn, so the partial redraws line up with the full ones.
+        self.bars = BarBuffer(bars)
+        self.figure, axes = ohlcv_plot(self.bars.frame, lod=False)
+        self.figure.set_size(width, height)
+        self.figure.set_title(title)
+
+        self.candles = axes[0].plot_series[0]
+        self.volumes = axes[1].plot_series[0]
+
+        self.scale = scale
+        self.surface = None
+
+        self.full_redraws = 0
+        self.partial_redraws = 0
+
+        self.redraw()
+
+    def _context(self) -> cairo.Context:
+        ctx = cairo.Context(self.surface)
+        ctx.scale(self.scale, self.scale)
+        return ctx
+
+    def _region(self, x0: float, y0: float, x1: float, y1: float) -> Region:
+
+        # Figure units to a whole pixel rect (x, y, w, h) on the surface.
+        s = self.scale
+        x, y = math.floor(x0 * s), math.floor(y0 * s)
+        return x, y, math.ceil(x1 * s) - x, math.ceil(y1 * s) - y
+
+    def redraw(self) -> Region:
+
+        # Lay out and paint everything onto the persistent surface.
+        fig = self.figure
+        if not fig.layout_valid:
+            fig.layout()
+
+        w, h = fig.rect.scale.xy
+        size = (math.ceil(w * self.scale), math.ceil(h * self.scale))
+        if self.surface is None or (self.surface.get_width(), self.surface.get_height()) != size:
+            self.surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, *size)
+
+        self.volumes.x = self.candles.bar_x()
+        fig.paint(self._context())
+        self.surface.flush()
+        self.full_redraws += 1
+
+        return (0, 0) + size
+
+    def update(self, bars: pd.DataFrame) -> Region:
+
+        # New bars, or a replacement for the forming one; returns the surface region that changed.
+        if len(bars) == 0:
+            return 0, 0, 0, 0
+
+        # Both panels share one copy of the bars.
+        n = len(self.bars)
+        start = self.bars.append(bars)
+        data = self.bars.frame
+        self.candles.extend(bars, data)
+        self.volumes.extend(bars, data)
+
+        # A wider y range moves every bar, so only then is the whole chart rescaled.
+        # So is replacing more than the forming bar, as the bars dropped may lie outside the new ones.
+        if not self.figure.layout_valid or start < n - 1:
+            return self.redraw()
+
+        # Repaint the changed bars and their left neighbour, clipped to the columns they cover.
+        first = max(start - 1, 0)
+        rows = data.iloc[first:]
+        _, x_left, x_right = bar_x(rows, self.candles.candle_width_scale)
+
+        ctx = self._context()
+        pad = 1.0
+        region = None
+
+        for series in (self.candles, self.volumes):
+
+            x0, y0 = series.transform_data.apply(x_left.min(), series.ylim[1])
+            x1, y1 = series.transform_data.apply(x_right.max(), series.ylim[0])
+            x0, x1 = x0 - pad, x1 + pad
+            y0, y1 = min(y0, y1) - pad, max(y0, y1) + pad
+
+            ctx.save()
+            ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+            ctx.clip()
+            ctx.set_source_rgba(*self.figure.background_color)
+            ctx.paint()
+            series.draw_bars(ctx, rows)
+            ctx.restore()
+
+            if region is None:
+                region = [x0, y0, x1, y1]
+            else:
+                region = [min(region[0], x0), min(region[1], y0), max(region[2], x1), max(region[3], y1)]
+
+        self.surface.flush()
+        self.partial_redraws += 1
+
+        return self._region(*region)
+
+    def to_array(self) -> np.ndarray:
+        return ArrayBackend(self.scale).result(self.surface)
+
+    def save(self, path):
+        self.surface.write_to_png(str(path))
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+_first = ('open', 't_open')
+_last = ('close', 't_close')
+_sum = ('volume', 'notional', 'count', 'buy_volume', 'sell_volume')
+
+
+def decimate(bars: pd.DataFrame, buckets: int, session_length: float) -> pd.DataFrame:
+
+    if len(bars) <= buckets:
+        return bars
+
+    # Bucket each bar by where it opens on the x axis.
+    bucket = np.floor(bars.t_open.values / session_length * buckets).astype(np.int64)
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.r_[starts[1:], len(bars)] - 1
+
+    # Merge the bars in each bucket, keeping the true high/low envelope and total volume.
+    cols = dict()
+    for c in bars.columns:
+        values = bars[c].values
+        if c in _first:
+            cols[c] = values[starts]
+        elif c in _last:
+            cols[c] = values[ends]
+        elif c == 'high':
+            cols[c] = np.maximum.reduceat(values, starts)
+        elif c == 'low':
+            cols[c] = np.minimum.reduceat(values, starts)
+        elif c in _sum:
+            cols[c] = np.add.reduceat(values, starts)
+
+    if 'vwap' in bars.columns and 'notional' in cols:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cols['vwap'] = cols['notional'] / cols['volume']
+
+    lod_df = pd.DataFrame(cols, columns=[c for c in bars.columns if c in cols])
+    lod_df.attrs = dict(bars.attrs)
+
+    return lod_df
@@ -1,9 +1,87 @@
+from contextlib import contextmanager
+import functools
+
 import numpy as np
 import cairo
 import pandas as pd
 
+from data import session
+
 from .plot_series import PlotSeries
-from .geometry import Point, Rect
+from .geometry import Affine, Point, Rect
+from .scale import AxisScale
+
+
+@functools.lru_cache(maxsize=64)
+def _session_axis_ticks(bounds: tuple, tz: str):
+    x_ticks, x_tick_labels = session.hour_ticks(*bounds, tz=tz)
+    return tuple(x_ticks), tuple(x_tick_labels)
+
+
+def _session_axis(data: pd.DataFrame):
+
+    # Session the bars were built on, or regular hours as seconds since midnight.
+    # Ticks are computed once per session and shared by all panels plotting it.
+    bounds = data.attrs.get('session')
+    if bounds is None:
+        bounds = (session.REGULAR_OPEN, session.REGULAR_CLOSE)
+        x_ticks, x_tick_labels = _session_axis_ticks(bounds, 'UTC')
+    else:
+        x_ticks, x_tick_labels = _session_axis_ticks(tuple(bounds), 'US/Eastern')
+
+    return bounds[1] - bounds[0], x_ticks, x_tick_labels
+
+
+@contextmanager
+def _path_space(ctx: cairo.Context, transform: Affine = None):
+
+    # Paths built inside are in the space mapped by transform; the CTM is restored before
+    # stroking, so line widths stay in device units.
+    if transform is None:
+        yield
+        return
+
+    ctx.save()
+    ctx.transform(transform.cairo_matrix())
+    try:
+        yield
+    finally:
+        ctx.restore()
+
+
+def _rectangles(ctx: cairo.Context,
+                x0: np.ndarray,
+                y0: np.ndarray,
+                x1: np.ndarray,
+                y1: np.ndarray,
+                color: tuple,
+                line_width: float = 0.5,
+                transform: Affine = None):
+
+    if len(x0) == 0:
+        return
+
+    with _path_space(ctx, transform):
+        for r in zip(x0.tolist(), y0.tolist(), (x1 - x0).tolist(), (y1 - y0).tolist()):
+            ctx.rectangle(*r)
+
+    ctx.set_source_rgb(*color)
+    ctx.fill_preserve()
+
+    ctx.set_source_rgb(0, 0, 0)
+    ctx.set_line_width(line_width)
+    ctx.stroke()
+
+
+def bar_x(data: pd.DataFrame, width_scale: float = 0.4):
+
+    # Bar centres and body edges in seconds since the open, shared by all panels of a chart.
+    x0 = data.t_open.values
+    x1 = data.t_close.values
+    x_mid = 0.5 * (x0 + x1)
+    half_w = 0.5 * width_scale * (x1 - x0)
+
+    return x_mid, x_mid - half_w, x_mid + half_w
 
 
 def _text(ctx, string, pos, theta):
@@ -21,12 +99,17 @@ def _text(ctx, string, pos, theta):
     ctx.restore()
 
 
-class TickCandles(PlotSeries):
+# Layout, data updates and the frame shared by the panels of bars over one session; subclasses draw
+# the panel itself.
+class BarSeries(PlotSeries):
 
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, x: tuple, y_columns: tuple, min_decimals: int = 0):
         super().__init__()
 
         self.data = data
+        self.x = x
+        self.session_length, self.x_ticks, self.x_tick_labels = _session_axis(data)
+        self.y_scale = AxisScale(y_columns, min_decimals=min_decimals)
 
         m = 20
         p = 10
@@ -40,15 +123,13 @@ class TickCandles(PlotSeries):
         self.x_axis_space = 30
         self.y_axis_space = 20
 
+        # Emit bar paths in data coordinates and let cairo apply transform_data.
+        self.cairo_transform = False
+
         self.background_color = (0, 0, 0, 0)
         self.border_color = (0.0, 0, 0, 1)
 
-        self.font_size = 12
-        self.font_face = 'InputSans'
-        self.tick_font_size = 8
-        self.axis_label_size = 10
-
-    def layout(self, rect: Rect, transform: np.ndarray):
+    def layout(self, rect: Rect, transform: Affine):
         m = self.margins
         p = self.padding
         b = self.border
@@ -63,15 +144,35 @@ class TickCandles(PlotSeries):
                                Point(w - m[0] - m[1] - 2 * b - p[0] - p[1], h - m[2] - m[3] - 2 * b - p[2] - p[3]))
         inner_pos = self.rect_inner.position
         inner_scale = self.rect_inner.scale
+        plot_rect = Rect(inner_pos, Point(inner_scale.x - self.x_axis_space, inner_scale.y - self.y_axis_space))
+
+        # Each level composes onto its parent's, down to a single data -> device transform.
+        self.y_scale.fit(self.data)
+        self.ylim = self.y_scale.limits
+        self.y_ticks, self.y_tick_labels = self.y_scale.ticks()
 
         self.transform = transform
-        self.transform_inner = np.array([[inner_scale.x, 0, inner_pos.x],
-                                         [0, -inner_scale.y, inner_pos.y + inner_scale.y],
-                                         [0, 0, 1]])
-        self.transform_plot = np.array([[inner_scale.x - self.x_axis_space, 0, inner_pos.x],
-                                        [0, -inner_scale.y + self.y_axis_space,
-                                            inner_pos.y + inner_scale.y - self.y_axis_space],
-                                        [0, 0, 1]])
+        self.transform_inner = transform @ Affine.from_rect(self.rect_inner, rect, flip_y=True)
+        self.transform_plot = transform @ Affine.from_rect(plot_rect, rect, flip_y=True)
+        self.transform_data = self.transform_plot @ Affine.scale_translate(
+            1 / self.session_length, 1 / (self.ylim[1] - self.ylim[0]),
+            0, -self.ylim[0] / (self.ylim[1] - self.ylim[0]))
+
+    def invalidate(self, layout: bool = True):
+        self.x = None
+        super().invalidate(layout)
+
+    def extend(self, rows: pd.DataFrame, data: pd.DataFrame):
+
+        # New data that differs from the current only in rows, e.g. from a live chart's bar buffer.
+        # Only these rows are scanned; the layout is redone only if they widen the y range.
+        self._data = data
+        self.invalidate(layout=self.y_scale.extend(rows, data))
+
+    def bar_x(self):
+        if self.x is None:
+            self.x = bar_x(self.data, self.candle_width_scale)
+        return self.x
 
     def draw(self, ctx: cairo.Context):
 
@@ -91,309 +192,212 @@ class TickCandles(PlotSeries):
 
         ctx.select_font_face(self.font_face, cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
         ctx.set_font_size(self.font_size)
-        self.draw_ticks(ctx)
 
-    def draw_ticks(self, ctx: cairo.Context):
 
-        #        green = (0, 0.4, 0.2)
-        #        red = (0.55, 0.15, 0)
-        green = (92 / 256, 214 / 256, 92 / 256)
-        red = (1, 102 / 256, 102 / 256)
+class TickCandles(BarSeries):
+
+    def __init__(self, data: pd.DataFrame, x: tuple = None):
+        super().__init__(data, x, ('low', 'high'), min_decimals=2)
+
+        self.font_size = 12
+        self.font_face = 'InputSans'
+        self.tick_font_size = 8
+        self.axis_label_size = 10
+
+    def draw(self, ctx: cairo.Context):
+        super().draw(ctx)
+        self.draw_ticks(ctx)
 
-        bars = self.data
+    def draw_ticks(self, ctx: cairo.Context):
 
-        ylim = (bars.low.min(), bars.high.max())
+        ylim = self.ylim
 
-        axis_x_0 = self.transform_plot @ np.array([-0.03, -0.06, 1])
-        axis_x_1 = self.transform_plot @ np.array([1.03, -0.06, 1])
-        axis_y_0 = self.transform_plot @ np.array([1.03, 1, 1])
+        axis_x_0 = self.transform_plot.apply(-0.03, -0.06)
+        axis_x_1 = self.transform_plot.apply(1.03, -0.06)
+        axis_y_0 = self.transform_plot.apply(1.03, 1)
 
         ctx.set_line_width(self.grid_line_width)
         ctx.set_source_rgb(0, 0, 0)
-        ctx.move_to(*axis_x_0[:2])
-        ctx.line_to(*axis_x_1[:2])
-        ctx.line_to(*axis_y_0[:2])
+        ctx.move_to(*axis_x_0)
+        ctx.line_to(*axis_x_1)
+        ctx.line_to(*axis_y_0)
         ctx.stroke()
 
         # Draw x ticks.
         ctx.set_font_size(self.tick_font_size)
-        x_ticks = [-0.5, ] + list(range(7))
-        x_tick_labels = ['9:30', ] + list(f'{10+i}:00' for i in x_ticks[1:])
-        for idx, tick in enumerate(x_ticks):
+        for idx, tick in enumerate(self.x_ticks):
 
-            grid_0 = self.transform_plot @ np.array([tick / 6.5 + 0.5 / 6.5, -0.06, 1])
-            grid_1 = self.transform_plot @ np.array([tick / 6.5 + 0.5 / 6.5, -0.08, 1])
+            grid_0 = self.transform_plot.apply(tick / self.session_length, -0.06)
+            grid_1 = self.transform_plot.apply(tick / self.session_length, -0.08)
 
             ctx.set_line_width(self.grid_line_width)
-            ctx.move_to(*grid_0[:2])
-            ctx.line_to(*grid_1[:2])
+            ctx.move_to(*grid_0)
+            ctx.line_to(*grid_1)
             ctx.set_source_rgb(0, 0, 0)
             ctx.stroke()
 
             ctx.set_source_rgb(0, 0, 0)
-            tick_label = x_tick_labels[idx]
+            tick_label = self.x_tick_labels[idx]
             (x, y, w, h, dx, dy) = ctx.text_extents(tick_label)
             ctx.move_to(grid_0[0] - w / 2, grid_0[1] + h / 2 + 0.9 * self.y_axis_space)
             ctx.show_text(tick_label)
 
         # Draw y ticks.
-        y_tick_min = np.ceil(ylim[0]) + 0
-        y_tick_max = np.ceil(ylim[1])
-
-        num_y_ticks = 6
-        tick_int = int((y_tick_max - y_tick_min) / num_y_ticks)
-
-        y_ticks = list(y_tick_min + i * tick_int for i in range(num_y_ticks))
-        y_tick_labels = list('{:.0f}.00'.format(i) for i in y_ticks)
+        for tick, label in zip(self.y_ticks, self.y_tick_labels):
 
-        for idx in range(num_y_ticks):
+            grid_0 = self.transform_plot.apply(1.03, (tick - ylim[0]) / (ylim[1] - ylim[0]))
+            grid_1 = self.transform_plot.apply(1.04, (tick - ylim[0]) / (ylim[1] - ylim[0]))
 
-            tick = y_ticks[idx]
-            label = y_tick_labels[idx]
-            grid_0 = self.transform_plot @ np.array([1.03, (tick - ylim[0]) / (ylim[1] - ylim[0]), 1])
-            grid_1 = self.transform_plot @ np.array([1.04, (tick - ylim[0]) / (ylim[1] - ylim[0]), 1])
-
-            ctx.move_to(*grid_0[:2])
-            ctx.line_to(*grid_1[:2])
+            ctx.move_to(*grid_0)
+            ctx.line_to(*grid_1)
             ctx.stroke()
 
-            (x, y, w, h, dx, dy) = ctx.text_extents(tick_label)
+            (x, y, w, h, dx, dy) = ctx.text_extents(label)
             ctx.move_to(grid_0[0] + w / 2 - 4, grid_0[1] + h / 2)
             ctx.show_text(label)
 
         ctx.set_font_size(self.axis_label_size)
-        p = self.transform_plot @ np.array([1.22, -0.98, 0])
-        _text(ctx, 'Price', p[:2], -np.pi / 2)
-
-        for idx in range(len(bars)):
-
-            x0 = bars.t_open.iloc[idx] / ((16 - 9.5) * 60 * 60)
-            x1 = bars.t_close.iloc[idx] / ((16 - 9.5) * 60 * 60)
+        p = self.transform_plot.apply_vector(1.22, -0.98)
+        _text(ctx, 'Price', p, -np.pi / 2)
 
-            h = bars.high.iloc[idx]
-            l = bars.low.iloc[idx]
-            o = bars.open.iloc[idx]
-            c = bars.close.iloc[idx]
+        self.draw_bars(ctx)
 
-            y0 = (l - ylim[0]) / (ylim[1] - ylim[0])
-            y1 = (h - ylim[0]) / (ylim[1] - ylim[0])
-
-            y2 = (o - ylim[0]) / (ylim[1] - ylim[0])
-            y3 = (c - ylim[0]) / (ylim[1] - ylim[0])
-
-            if y2 < y3:
-                c = green
-            else:
-                c = red
-
-            ctx.set_source_rgb(*c)
-            y2, y3 = min(y2, y3), max(y2, y3)
-
-            x_mid = 0.5 * (x0 + x1)
-
-            line_0 = np.array([x_mid, y0, 1.0])
-            line_1 = np.array([x_mid, y1, 1.0])
-
-            line_0 = self.transform_plot @ line_0
-            line_1 = self.transform_plot @ line_1
-
-            ctx.set_source_rgb(0, 0, 0)
-            ctx.set_line_width(self.stick_line_width)
-            ctx.move_to(*line_0[: 2])
-            ctx.line_to(*line_1[: 2])
-            ctx.stroke()
-
-            w, h = x1 - x0, y3 - y2
-
-            ctx.set_source_rgb(*c)
-
-            candle_0 = self.transform_plot @ np.array([x_mid - 0.5 * self.candle_width_scale * w, y2, 1])
-            candle_1 = self.transform_plot @ np.array([x_mid + 0.5 * self.candle_width_scale * w, y3, 1])
-            candle_sc = candle_1 - candle_0
-
-            ctx.rectangle(*candle_0[: 2], *candle_sc[: 2])
-            ctx.fill_preserve()
-
-            ctx.set_source_rgb(0, 0, 0)
-            ctx.set_line_width(0.5)
-            ctx.stroke()
+    def draw_bars(self, ctx: cairo.Context, bars: pd.DataFrame = None):
 
+        green = (92 / 256, 214 / 256, 92 / 256)
+        red = (1, 102 / 256, 102 / 256)
 
-class TickVolume(PlotSeries):
+        # All bars, or just the given rows, e.g. the ones a live chart redraws.
+        if bars is None:
+            bars = self.data
+            x_mid, x_left, x_right = self.bar_x()
+        else:
+            x_mid, x_left, x_right = bar_x(bars, self.candle_width_scale)
+
+        # Candle geometry for all bars at once, in data coordinates.
+        y_open = bars.open.values
+        y_close = bars.close.values
+        up = y_open < y_close
+
+        wick_x, wick_y0, wick_y1 = x_mid, bars.low.values, bars.high.values
+        body_x0, body_y0 = x_left, np.minimum(y_open, y_close)
+        body_x1, body_y1 = x_right, np.maximum(y_open, y_close)
+
+        # Map to device coordinates in one transform each, unless cairo does it.
+        transform = None
+        if self.cairo_transform:
+            transform = self.transform_data
+        else:
+            wick_x, wick_y0 = self.transform_data.apply(wick_x, wick_y0)
+            _, wick_y1 = self.transform_data.apply(x_mid, wick_y1)
+            body_x0, body_y0 = self.transform_data.apply(body_x0, body_y0)
+            body_x1, body_y1 = self.transform_data.apply(body_x1, body_y1)
+
+        # All wicks as one path.
+        ctx.set_source_rgb(0, 0, 0)
+        ctx.set_line_width(self.stick_line_width)
+        with _path_space(ctx, transform):
+            for x, y0, y1 in zip(wick_x.tolist(), wick_y0.tolist(), wick_y1.tolist()):
+                ctx.move_to(x, y0)
+                ctx.line_to(x, y1)
+        ctx.stroke()
 
-    def __init__(self, data: pd.DataFrame):
-        super().__init__()
+        # One filled and outlined path of bodies per color.
+        _rectangles(ctx, body_x0[up], body_y0[up], body_x1[up], body_y1[up], green, transform=transform)
+        _rectangles(ctx, body_x0[~up], body_y0[~up], body_x1[~up], body_y1[~up], red, transform=transform)
 
-        self.data = data
 
-        m = 20
-        p = 10
-        b = 0
-        self.margins = (m,) * 4
-        self.padding = (p,) * 4
-        self.border = b
-        self.grid_line_width = 0.5
-        self.stick_line_width = 0.5
-        self.candle_width_scale = 0.4
-        self.x_axis_space = 30
-        self.y_axis_space = 20
+class TickVolume(BarSeries):
 
-        self.background_color = (0, 0, 0, 0)
-        self.border_color = (0.0, 0, 0, 1)
+    def __init__(self, data: pd.DataFrame, x: tuple = None):
+        super().__init__(data, x, ('volume',))
 
         self.font_size = 8
         self.font_face = 'InputSans'
         self.axis_label_size = 10
         self.tick_label_size = 8
 
-    def layout(self, rect: Rect, transform: np.ndarray):
-        m = self.margins
-        p = self.padding
-        b = self.border
-
-        self.rect = rect
-        w, h = self.rect.scale.xy
-
-        self.rect_outer = Rect(Point(rect.position.x + m[0] + 0.5 * b, rect.position.y + m[2] + 0.5 * b),
-                               Point(w - m[0] - m[1] - b, h - m[2] - m[3] - b))
-
-        self.rect_inner = Rect(Point(rect.position.x + m[0] + b + p[0], rect.position.y + m[2] + b + p[2]),
-                               Point(w - m[0] - m[1] - 2 * b - p[0] - p[1], h - m[2] - m[3] - 2 * b - p[2] - p[3]))
-        inner_pos = self.rect_inner.position
-        inner_scale = self.rect_inner.scale
-
-        self.transform = transform
-        self.transform_inner = np.array([[inner_scale.x, 0, inner_pos.x],
-                                         [0, -inner_scale.y, inner_pos.y + inner_scale.y],
-                                         [0, 0, 1]])
-        self.transform_plot = np.array([[inner_scale.x - self.x_axis_space, 0, inner_pos.x],
-                                        [0, -inner_scale.y + self.y_axis_space,
-                                         inner_pos.y + inner_scale.y - self.y_axis_space],
-                                        [0, 0, 1]])
-
     def draw(self, ctx: cairo.Context):
-
-        p0 = self.rect_inner.position
-        s0 = self.rect_inner.scale
-
-        if self.background_color[-1] > 0:
-            ctx.set_source_rgba(*self.background_color)
-            ctx.rectangle(*p0.xy, *s0.xy)
-            ctx.fill()
-
-        if self.border > 0 and self.border_color[-1] > 0:
-            ctx.set_line_width(self.border)
-            ctx.set_source_rgba(*self.border_color)
-            ctx.rectangle(*p0.xy, *s0.xy)
-            ctx.stroke()
-
-        ctx.select_font_face(self.font_face, cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
-        ctx.set_font_size(self.font_size)
+        super().draw(ctx)
         self.draw_volumes(ctx)
 
     def draw_volumes(self, ctx: cairo.Context):
 
-        green = (92 / 256, 214 / 256, 92 / 256)
-        red = (1, 102 / 256, 102 / 256)
-
-        bars = self.data
+        ylim = self.ylim
 
-        ylim = (bars.volume.min(), bars.volume.max())
-
-        axis_x_0 = self.transform_plot @ np.array([-0.03, -0.06, 1])
-        axis_x_1 = self.transform_plot @ np.array([1.03, -0.06, 1])
-        axis_y_0 = self.transform_plot @ np.array([1.03, 1, 1])
+        axis_x_0 = self.transform_plot.apply(-0.03, -0.06)
+        axis_x_1 = self.transform_plot.apply(1.03, -0.06)
+        axis_y_0 = self.transform_plot.apply(1.03, 1)
 
         ctx.set_line_width(self.grid_line_width)
         ctx.set_source_rgb(0, 0, 0)
-        ctx.move_to(*axis_x_0[:2])
-        ctx.line_to(*axis_x_1[:2])
-        ctx.line_to(*axis_y_0[:2])
+        ctx.move_to(*axis_x_0)
+        ctx.line_to(*axis_x_1)
+        ctx.line_to(*axis_y_0)
         ctx.stroke()
 
         ctx.set_font_size(self.tick_label_size)
-        x_ticks = [-0.5, ] + list(range(7))
-        x_tick_labels = ['9:30', ] + list(f'{10+i}:00' for i in x_ticks[1:])
-        for idx, tick in enumerate(x_ticks):
+        for idx, tick in enumerate(self.x_ticks):
 
-            grid_0 = self.transform_plot @ np.array([tick / 6.5 + 0.5 / 6.5, -0.06, 1])
-            grid_1 = self.transform_plot @ np.array([tick / 6.5 + 0.5 / 6.5, -0.08, 1])
+            grid_0 = self.transform_plot.apply(tick / self.session_length, -0.06)
+            grid_1 = self.transform_plot.apply(tick / self.session_length, -0.08)
 
             ctx.set_line_width(self.grid_line_width)
-            ctx.move_to(*grid_0[:2])
-            ctx.line_to(*grid_1[:2])
+            ctx.move_to(*grid_0)
+            ctx.line_to(*grid_1)
             ctx.set_source_rgb(0, 0, 0)
             ctx.stroke()
 
             ctx.set_source_rgb(0, 0, 0)
-            tick_label = x_tick_labels[idx]
+            tick_label = self.x_tick_labels[idx]
             (x, y, w, h, dx, dy) = ctx.text_extents(tick_label)
             ctx.move_to(grid_0[0] - w / 2, grid_0[1] + h / 2 + 0.9 * self.y_axis_space)
             ctx.show_text(tick_label)
 
-        y_tick_min = np.ceil(ylim[0]) + 0
-        y_tick_max = np.ceil(ylim[1])
-
-        num_y_ticks = 6
-        tick_int = int((y_tick_max - y_tick_min) / num_y_ticks)
-
-        y_ticks = list(y_tick_min + i * tick_int for i in range(num_y_ticks))
-        y_tick_labels = list('{:.0f}'.format(i) for i in y_ticks)
+        for tick, label in zip(self.y_ticks, self.y_tick_labels):
 
-        for idx in range(num_y_ticks):
+            grid_0 = self.transform_plot.apply(1.03, (tick - ylim[0]) / (ylim[1] - ylim[0]))
+            grid_1 = self.transform_plot.apply(1.04, (tick - ylim[0]) / (ylim[1] - ylim[0]))
 
-            tick = y_ticks[idx]
-            label = y_tick_labels[idx]
-            grid_0 = self.transform_plot @ np.array([1.03, (tick - ylim[0]) / (ylim[1] - ylim[0]), 1])
-            grid_1 = self.transform_plot @ np.array([1.04, (tick - ylim[0]) / (ylim[1] - ylim[0]), 1])
-
-            ctx.move_to(*grid_0[:2])
-            ctx.line_to(*grid_1[:2])
+            ctx.move_to(*grid_0)
+            ctx.line_to(*grid_1)
             ctx.stroke()
 
-            (x, y, w, h, dx, dy) = ctx.text_extents(tick_label)
+            (x, y, w, h, dx, dy) = ctx.text_extents(label)
             ctx.move_to(grid_0[0] + w / 2 - 4, grid_0[1] + h / 2)
             ctx.show_text(label)
 
         ctx.set_font_size(self.axis_label_size)
-        p = self.transform_plot @ np.array([1.22, -0.5, 0])
-        p += np.array([0, self.rect_inner.position.y, 1])
-        _text(ctx, 'Volume', p[:2], -np.pi / 2)
-
-        for idx in range(len(bars)):
-
-            x0 = bars.t_open.iloc[idx] / ((16 - 9.5) * 60 * 60)
-            x1 = bars.t_close.iloc[idx] / ((16 - 9.5) * 60 * 60)
-
-            h = bars.high.iloc[idx]
-            l = bars.low.iloc[idx]
-            o = bars.open.iloc[idx]
-            c = bars.close.iloc[idx]
-            v = bars.volume.iloc[idx]
-
-            y0 = 0
-            y1 = (v - ylim[0]) / (ylim[1] - ylim[0])
+        p = self.transform_plot.apply_vector(1.22, -0.5)
+        p = (p[0], p[1] + self.rect_inner.position.y)
+        _text(ctx, 'Volume', p, -np.pi / 2)
 
-            if o < c:
-                c = green
-            else:
-                c = red
+        self.draw_bars(ctx)
 
-            ctx.set_source_rgb(*c)
+    def draw_bars(self, ctx: cairo.Context, bars: pd.DataFrame = None):
 
-            x_mid = 0.5 * (x0 + x1)
-
-            w, h = x1 - x0, y1 - y0
-
-            ctx.set_source_rgb(*c)
-
-            vol_bar_0 = self.transform_plot @ np.array([x_mid - 0.5 * self.candle_width_scale * w, y0, 1])
-            vol_bar_1 = self.transform_plot @ np.array([x_mid + 0.5 * self.candle_width_scale * w, y1, 1])
-            vol_bar_sc = vol_bar_1 - vol_bar_0
-
-            ctx.rectangle(*vol_bar_0[:2], *vol_bar_sc[:2])
-            ctx.fill_preserve()
+        green = (92 / 256, 214 / 256, 92 / 256)
+        red = (1, 102 / 256, 102 / 256)
 
-            ctx.set_source_rgb(0, 0, 0)
-            ctx.set_line_width(0.5)
-            ctx.stroke()
+        # All bars, or just the given rows, e.g. the ones a live chart redraws.
+        if bars is None:
+            bars = self.data
+            x_mid, x0, x1 = self.bar_x()
+        else:
+            x_mid, x0, x1 = bar_x(bars, self.candle_width_scale)
+
+        # Volume bar geometry for all bars at once, in data coordinates.
+        y1 = bars.volume.values
+        y0 = np.full_like(y1, self.ylim[0], dtype=float)
+        up = bars.open.values < bars.close.values
+
+        transform = None
+        if self.cairo_transform:
+            transform = self.transform_data
+        else:
+            x0, y0 = self.transform_data.apply(x0, y0)
+            x1, y1 = self.transform_data.apply(x1, y1)
+
+        # One filled and outlined path of bars per color.
+        _rectangles(ctx, x0[up], y0[up], x1[up], y1[up], green, transform=transform)
+        _rectangles(ctx, x0[~up], y0[~up], x1[~up], y1[~up], red, transform=transform)
@@ -5,6 +5,7 @@ import pandas as pd
 from .figure import Figure
 from .axes import Axes
 from .ohlcv import TickVolume, TickCandles
+from .lod import decimate
 
 
 def subplots(num_rows: int, num_cols: int):
@@ -34,16 +35,25 @@ def subplots(num_rows: int, num_cols: int):
     return fig, axes
 
 
-def ohlcv_plot(data: pd.DataFrame):
+def ohlcv_plot(data: pd.DataFrame, lod: bool = True):
 
     fig, axes = subplots(2, 1)
-    axes[0].plot_series.append(TickCandles(data))
-    axes[1].plot_series.append(TickVolume(data))
+    candles = TickCandles(data)
+    volumes = TickVolume(data)
+    axes[0].plot_series.append(candles)
+    axes[1].plot_series.append(volumes)
 
 #    fig.set_title(f'{model.contract} {model.date}')
 
     fig.layout()
-    fig.draw()
+
+    # Re-aggregate to at most one bar per pixel of plot width.
+    if lod:
+        width = int(candles.transform_plot.xx)
+        if len(data) > width:
+            candles.data = volumes.data = decimate(data, width, candles.session_length)
+
+    volumes.x = candles.bar_x()
 
     return fig, axes
 
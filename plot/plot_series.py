@@ -1,3 +1,22 @@
 class PlotSeries:
     def __init__(self):
-        pass
+        self.parent = None
+        self.layout_valid = False
+        self._data = None
+
+    def invalidate(self, layout: bool = True):
+        if layout:
+            self.layout_valid = False
+        if self.parent is not None:
+            self.parent.invalidate(layout)
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+
+        # The data -> device transform depends on the data extents, so new data needs a layout.
+        self._data = data
+        self.invalidate()
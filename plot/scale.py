@@ -0,0 +1,84 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def nice_number(x: float) -> float:
+
+    # Nearest 1, 2 or 5 times a power of ten.
+    exp = np.floor(np.log10(x))
+    f = x / 10 ** exp
+    nf = 1 if f < 1.5 else 2 if f < 3 else 5 if f < 7 else 10
+
+    return nf * 10 ** exp
+
+
+def nice_ticks(lo: float, hi: float, num_ticks: int = 6) -> Tuple[np.ndarray, float]:
+
+    step = nice_number((hi - lo) / max(num_ticks - 1, 1))
+    first = np.ceil(lo / step) * step
+    count = int(np.floor((hi - first) / step + 1e-9)) + 1
+
+    return first + step * np.arange(max(count, 0)), step
+
+
+class AxisScale:
+
+    def __init__(self, columns: Tuple[str, ...], num_ticks: int = 6, min_decimals: int = 0):
+        self.columns = columns
+        self.num_ticks = num_ticks
+        self.min_decimals = min_decimals
+
+        # Frame the extent was last computed over; anything else is rescanned.
+        self.source = None
+        self.lo = np.inf
+        self.hi = -np.inf
+
+        self._ticks = None
+
+    def fit(self, data: pd.DataFrame):
+        if data is not self.source:
+            self.lo = np.inf
+            self.hi = -np.inf
+            self.extend(data, data)
+
+    def extend(self, rows: pd.DataFrame, data: pd.DataFrame) -> bool:
+
+        # Widen the extent over appended or updated rows only, now part of data.
+        # Bars only ever grow, so the extent never needs to shrink. Returns whether it changed.
+        self.source = data
+        if len(rows) == 0:
+            return False
+
+        lo = min(np.nanmin(rows[c].values) for c in self.columns)
+        hi = max(np.nanmax(rows[c].values) for c in self.columns)
+
+        changed = lo < self.lo or hi > self.hi
+        self.lo = min(self.lo, lo)
+        self.hi = max(self.hi, hi)
+
+        return changed
+
+    @property
+    def limits(self) -> Tuple[float, float]:
+
+        # A flat series gets a small band around its value, so the scale never divides by zero.
+        if self.hi > self.lo:
+            return float(self.lo), float(self.hi)
+
+        pad = max(abs(self.lo) * 5e-3, 5e-3) if np.isfinite(self.lo) else 0.5
+        lo = self.lo if np.isfinite(self.lo) else 0.0
+        return float(lo - pad), float(lo + pad)
+
+    def ticks(self) -> Tuple[np.ndarray, List[str]]:
+
+        # Tick positions and labels, recomputed only when the limits change.
+        limits = self.limits
+        if self._ticks is None or self._ticks[0] != limits:
+            ticks, step = nice_ticks(*limits, self.num_ticks)
+            decimals = max(self.min_decimals, -int(np.floor(np.log10(step))))
+            labels = ['{:.{}f}'.format(t, decimals) for t in ticks]
+            self._ticks = (limits, ticks, labels)
+
+        return self._ticks[1], self._ticks[2]
@@ -20,7 +20,7 @@ setuptools.setup(
         'pycairo>=1.19.1',
         'requests>=2',
     ],
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=['tests', 'tests.*', 'bench', 'bench.*']),
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from data.bars import imbalance_bars
+
+from .test_nbars import _ticks
+
+
+# Plain definition: sign trades by the tick rule and close a bar once the absolute cumulative imbalance
+# since its first tick reaches threshold.
+def _imbalance_counts(price: np.ndarray, threshold: int) -> list:
+
+    counts = list()
+    sign = 0
+    imbalance = count = 0
+    for i in range(len(price)):
+        if i > 0 and price[i] != price[i - 1]:
+            sign = 1 if price[i] > price[i - 1] else -1
+        imbalance += sign
+        count += 1
+        if abs(imbalance) >= threshold:
+            counts.append(count)
+            imbalance = count = 0
+
+    if count > 0:
+        counts.append(count)
+
+    return counts
+
+
+@pytest.mark.parametrize('threshold', [1, 2, 5, 20])
+def test_imbalance_bars_matches_loop(threshold):
+
+    ticks_df = _ticks(1000)
+    bars_df = imbalance_bars(ticks_df, threshold)
+
+    assert bars_df['count'].tolist() == _imbalance_counts(ticks_df.price.values, threshold)
+
+
+def test_imbalance_bars_threshold_above_any_run():
+
+    ticks_df = _ticks(200)
+    bars_df = imbalance_bars(ticks_df, 10 ** 6)
+
+    assert bars_df['count'].tolist() == [200]
+
+
+def test_imbalance_bars_flat_price():
+
+    ticks_df = _ticks(200)
+    ticks_df['price'] = 10.0
+    bars_df = imbalance_bars(ticks_df, 5)
+
+    assert bars_df['count'].tolist() == _imbalance_counts(ticks_df.price.values, 5) == [200]
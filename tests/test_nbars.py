@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.ticks import nbars
+
+
+# The groupby implementation nbars replaced, kept as the reference output.
+def _nbars_groupby(data: pd.DataFrame, n: int = 20):
+
+    groups = data.groupby(data.index // n)
+
+    cols = ['open', 'high', 'low', 'close', 'volume', 't_open', 't_close']
+    rows = list()
+    for key, item in groups:
+        rows.append([
+            item.iloc[0].price,
+            item.price.max(),
+            item.price.min(),
+            item.iloc[-1].price,
+            item.price.sum(),
+            item.iloc[0].timestamp,
+            item.iloc[-1].timestamp])
+
+    bars_df = pd.DataFrame(data=rows, columns=cols)
+
+    t0 = bars_df.t_open.iloc[0].replace(hour=9, minute=30, second=0).timestamp()
+    t1 = bars_df.t_open.iloc[0].replace(hour=16, minute=0, second=0).timestamp()
+    td = 1 / (t1 - t0) * (16 - 9.5) * 60 * 60
+
+    bars_df.t_open = bars_df.t_open.apply(lambda x: (x.timestamp() - t0) * td)
+    bars_df.t_close = bars_df.t_close.apply(lambda x: (x.timestamp() - t0) * td)
+
+    return bars_df
+
+
+def _ticks(count: int, seed: int = 0) -> pd.DataFrame:
+
+    # Whole-second, cents and lots, as ticks come out of the database.
+    rng = np.random.default_rng(seed)
+    t0 = pd.Timestamp('2020-07-29 09:30', tz='US/Eastern').timestamp()
+    timestamp = t0 + np.sort(rng.integers(0, 6.5 * 60 * 60, count)).astype(np.float64)
+    price = 1000 + np.cumsum(rng.integers(-3, 4, count))
+    size = rng.integers(1, 50, count)
+
+    return pd.DataFrame({'timestamp': pd.to_datetime(timestamp, unit='s', utc=True).tz_convert('US/Eastern'),
+                         'price': price * 1e-2,
+                         'size': size * 1e2})
+
+
+@pytest.mark.parametrize('n', [1, 7, 20, 1000, 5000])
+def test_nbars_matches_groupby(n):
+
+    ticks_df = _ticks(1000)
+    expected = _nbars_groupby(ticks_df, n)
+    bars_df = nbars(ticks_df, n)
+
+    assert len(bars_df) == len(expected)
+    for c in ('open', 'high', 'low', 'close', 't_open', 't_close'):
+        np.testing.assert_array_equal(bars_df[c].values, expected[c].values, err_msg=c)
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from data import bars
+from data.stream import Bar, chunk_bars
+
+from .test_nbars import _ticks
+
+builders = {'tick': (bars.tick_bars, 20),
+            'time': (bars.time_bars, 60),
+            'volume': (bars.volume_bars, 2e4),
+            'dollar': (bars.dollar_bars, 2e5)}
+
+
+def _chunks(ticks_df: pd.DataFrame, chunk_size: int):
+    for i in range(0, len(ticks_df), chunk_size):
+        yield ticks_df.iloc[i:i + chunk_size].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 17, 5000])
+@pytest.mark.parametrize('kind', list(builders))
+def test_chunk_bars_matches_batch(kind, chunk_size):
+
+    ticks_df = _ticks(1000)
+    build, size = builders[kind]
+
+    expected = build(ticks_df, size)
+    bars_df = chunk_bars(_chunks(ticks_df, chunk_size), kind, size)
+
+    assert_frame_equal(bars_df, expected, check_exact=True)
+    assert bars_df.attrs['session'] == expected.attrs['session']
+
+
+def test_chunk_bars_no_chunks():
+
+    bars_df = chunk_bars([])
+
+    assert len(bars_df) == 0
+    assert list(bars_df.columns) == list(Bar._fields)